@@ -4,6 +4,7 @@ from pathlib import Path
 
 from pycam.doas.ifit_worker import IFitWorker
 from pycam.so2_camera_processor import PyplisWorker
+from pycam.logging.logging_tools import LoggerManager
 
 
 def get_args():
@@ -76,6 +77,7 @@ def setup_ifit_worker(config_path):
     return ifit_worker
 
 if __name__ == "__main__":
+    LoggerManager.configure_root()
     args = get_args()
     
     if args.command == 'doas':
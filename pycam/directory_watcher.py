@@ -149,6 +149,10 @@ class Handler(FileSystemEventHandler):
     def on_created(self, event):
         self.func(event.src_path, None)
 
+    def on_moved(self, event):
+        # Files written to a temporary name and then renamed into place (e.g. by io_py.save_img) only appear as a move
+        self.func(event.dest_path, None)
+
 
 # ======================================================================================================================
 
@@ -414,7 +418,7 @@ try:
 
                     file_path = os.path.join(self.dir_to_watch, event.name)
 
-                    if event.action == 1:  # file creation event
+                    if event.action in (1, 5):  # file creation or rename (new name) event
                         t = datetime.datetime.utcnow()
                         self.__created_files[file_path] = calendar.timegm(t.timetuple()) + t.microsecond * 1e-6
                         self.__new_files_q.put(file_path)
@@ -438,8 +442,8 @@ try:
                 if '.log' in path:
                     continue
 
-                # Ignore lock files as otherwise this watcher recreates the file - not good
-                if '.lock' in path:
+                # Ignore lock and partially written files as otherwise this watcher recreates the file - not good
+                if '.lock' in path or path.endswith('.part'):
                     continue
 
                 # Ignore darkcorr images - we don't want to plot these
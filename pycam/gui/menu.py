@@ -8,13 +8,14 @@ from pycam.gui.cfg_menu_frames import geom_settings, process_settings, plume_bg,
     opti_flow, light_dilution, cross_correlation, doas_fov, basic_acq_handler, automated_acq_handler,\
     calibration_wind, instrument_cfg, temp_log, plume_velocity, nadeau_flow, comm_recv_handler
 from pycam.gui.misc import About, LoadSaveProcessingSettings
-from pycam.io_py import save_pcs_line, load_pcs_line, save_light_dil_line, load_light_dil_line, create_video
+from pycam.io_py import save_pcs_line, load_pcs_line, save_light_dil_line, load_light_dil_line, create_video, blosc2
 import pycam.gui.settings as settings
 from pycam.networking.FTP import FileTransferGUI
 from pycam.cfg import pyplis_worker, process_defaults_loc
 from pycam.doas.cfg import doas_worker
 from pycam.setupclasses import FileLocator, ConfigInfo
-from pycam.networking.ssh import open_ssh, ssh_cmd, close_ssh
+from pycam.networking.ssh import ssh_cmd
+from pycam.networking.ssh_pool import pool as ssh_pool
 from pycam.utils import truncate_path
 from pycam.exceptions import InvalidCalibration
 from pycam.logging.logging_tools import LoggerManager
@@ -107,9 +108,9 @@ class PyMenu:
         self.submenu_cmd = tk.Menu(self.frame, tearoff=0)
         self.menus[tab].add_cascade(label='Commands', menu=self.submenu_cmd)
         self.submenu_cmd.add_command(label='Run pycam (without automated capture)',
-                                     command=lambda: run_pycam(cfg.sock.host_ip, auto_capt=0))
+                                     command=lambda: run_pycam(cfg.sock.host_ip, auto_capt=0, root=self.frame))
         self.submenu_cmd.add_command(label='Run pycam (with automated capture)',
-                                     command=lambda: run_pycam(cfg.sock.host_ip, auto_capt=1))
+                                     command=lambda: run_pycam(cfg.sock.host_ip, auto_capt=1, root=self.frame))
         self.submenu_cmd.add_separator()
         self.submenu_cmd.add_command(label='Stop pycam', command=lambda: instrument_cmd('EXT'))
         self.submenu_cmd.add_separator()
@@ -277,9 +278,8 @@ class PyMenu:
         :param ip:  str     IP address of pi
         """
         try:
-            client = open_ssh(ip, uname=username, pwd=password, port=port)
-            ssh_cmd(client, 'python3 {}'.format(FileLocator.MOUNT_SSD_SCRIPT))
-            close_ssh(client)
+            with ssh_pool.get_connection(ip, uname=username, pwd=password, port=port) as client:
+                ssh_cmd(client, 'python3 {}'.format(FileLocator.MOUNT_SSD_SCRIPT))
             messagebox.showinfo('SSD mounted', 'SSD should now be successfully mounted to the Raspberry Pi')
         except BaseException as e:
             messagebox.showerror('Error mounting SSD',
@@ -292,9 +292,8 @@ class PyMenu:
         :param ip:  str     IP address of pi
         """
         try:
-            client = open_ssh(ip, uname=username, pwd=password, port=port)
-            ssh_cmd(client, 'python3 {}'.format(FileLocator.UNMOUNT_SSD_SCRIPT))
-            close_ssh(client)
+            with ssh_pool.get_connection(ip, uname=username, pwd=password, port=port) as client:
+                ssh_cmd(client, 'python3 {}'.format(FileLocator.UNMOUNT_SSD_SCRIPT))
             messagebox.showinfo('SSD unmounted', 'SSD should now be successfully unmounted to the Raspberry Pi')
         except BaseException as e:
             messagebox.showerror('Error unmounting SSD',
@@ -311,9 +310,8 @@ class PyMenu:
                                 'Are you sure you want to proceed?')
         if a:
             try:
-                client = open_ssh(ip, uname=username, pwd=password, port=22)
-                ssh_cmd(client, 'python3 {}'.format(FileLocator.CLEAR_SSD_SCRIPT))
-                close_ssh(client)
+                with ssh_pool.get_connection(ip, uname=username, pwd=password, port=22) as client:
+                    ssh_cmd(client, 'python3 {}'.format(FileLocator.CLEAR_SSD_SCRIPT))
                 messagebox.showinfo('SSD cleared', 'SSD data has been cleared.')
             except BaseException:
                 messagebox.showerror('Error deleting data',
@@ -359,9 +357,8 @@ class PyMenu:
                                 'Are you sure you want to proceed?'.format(space))
         if a:
             try:
-                client = open_ssh(ip, uname=username, pwd=password, port=port)
-                ssh_cmd(client, 'python3 {} {}'.format(FileLocator.FREE_SPACE_SSD_SCRIPT, space))
-                close_ssh(client)
+                with ssh_pool.get_connection(ip, uname=username, pwd=password, port=port) as client:
+                    ssh_cmd(client, 'python3 {} {}'.format(FileLocator.FREE_SPACE_SSD_SCRIPT, space))
                 messagebox.showinfo('SSD cleared', 'SSD data has been cleared.')
             except BaseException:
                 messagebox.showerror('Error deleting data',
@@ -879,6 +876,8 @@ class SaveFrame(LoadSaveProcessingSettings):
                      'save_doas_cal': int}
 
         self.img_types = ['.npy', '.mat']
+        if blosc2 is not None:
+            self.img_types.append('.b2nd')    # Compressed numpy format, only offered if blosc2 is installed
         self.fig_so2_units = ['ppmm', 'tau']
         self._save_img_aa = tk.BooleanVar()
         self._type_img_aa = tk.StringVar()
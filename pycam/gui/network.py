@@ -3,7 +3,8 @@
 """Code to build interface between the GUI and the instrument"""
 
 import pycam.gui.cfg as cfg
-from pycam.networking.ssh import open_ssh, close_ssh, ssh_cmd
+from pycam.networking.ssh import ssh_cmd, ssh_cmd_stdin
+from pycam.networking.ssh_pool import pool as ssh_pool
 from pycam.networking.sockets import read_network_file
 from pycam.setupclasses import FileLocator, ConfigInfo
 from pycam.io_py import write_script_crontab, read_script_crontab
@@ -13,20 +14,41 @@ from pycam.logging.logging_tools import LoggerManager
 import tkinter as tk
 import tkinter.ttk as ttk
 from tkinter import messagebox
-import subprocess
-import platform
-import time
+import socket
+import queue
 import datetime
+import functools
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
 GuiLogger = LoggerManager.add_logger("GUI")
 
-def run_pycam(ip, auto_capt=1):
-    """Runs main pycam script on remote machine"""
+# Worker threads for connection tests - keeps probes off the Tk thread and limits how many can run at once
+_probe_pool = ThreadPoolExecutor(max_workers=2)
+
+def run_pycam(ip, root, auto_capt=1):
+    """Runs main pycam script on remote machine. The SSH command is run in a background thread so the GUI isn't blocked
+
+    :param ip:          str     IP address of instrument
+    :param root:        tk widget used to pass the result back to the Tk thread
+    :param auto_capt:   int     Passed to pycam_master2.py - 1 starts automated capture straight away
+    """
     if messagebox.askyesno("Please confirm", "Are you sure you want to run pycam_master2.py?\n"
                                              "Running this on a machine which already has the script running could cause issues"):
         GuiLogger.info(f'Running pycam_master2.py on {ip}')
 
+        # Show busy cursor until the command has been sent
+        root = root.winfo_toplevel()
+        root.config(cursor='watch')
+
+        run_thread = threading.Thread(target=_run_pycam, args=(ip, auto_capt, root))
+        run_thread.daemon = True
+        run_thread.start()
+
+
+def _run_pycam(ip, auto_capt, root):
+    """Worker for run_pycam() - sends the SSH command. Runs off the Tk thread, so all GUI updates go through root.after"""
+    try:
         # Read configuration file which contains important information for various things
         config = read_file(FileLocator.CONFIG_WINDOWS)
 
@@ -38,22 +60,22 @@ def run_pycam(ip, auto_capt=1):
         pwd = config[ConfigInfo.pwd]
         port = config[ConfigInfo.ssh_port]
 
-        try:
-            # Open ssh connection
-            connection = open_ssh(ip, uname=uname, pwd=pwd, port=port)
-        except TimeoutError:
-            messagebox.showerror('Connection Timeout', 'Attempt to run pycam on {} timed out. Please ensure that the'
-                                                       'instrument is accesible at that IP address'.format(ip))
-            return
-
-        # Run ssh command
-        _, stderr, stdout = ssh_cmd(connection, 'nohup /usr/bin/python3 {} {} > /dev/null 2>&1 &'.format(pycam_path, auto_capt), background=False)
+        # Get pooled ssh connection and run ssh command
+        with ssh_pool.get_connection(ip, uname=uname, pwd=pwd, port=port) as connection:
+            _, stderr, stdout = ssh_cmd(connection, 'nohup /usr/bin/python3 {} {} > /dev/null 2>&1 &'.format(pycam_path, auto_capt), background=False)
 
         # print('STDERR: {}'.format(stderr.read().decode()))
         # print('STDOUT: {}'.format(stdout.read().decode()))
-
-        # Close ssh connection
-        close_ssh(connection)
+    except TimeoutError:
+        root.after(0, messagebox.showerror, 'Connection Timeout',
+                   'Attempt to run pycam on {} timed out. Please ensure that the'
+                   'instrument is accesible at that IP address'.format(ip))
+    except Exception as e:
+        GuiLogger.error(e)
+        root.after(0, messagebox.showerror, 'Error running pycam',
+                   'An error occurred when attempting to run pycam on {} via SSH.\n{}'.format(ip, e))
+    finally:
+        root.after(0, lambda: root.config(cursor=''))
 
 
 def instrument_cmd(cmd):
@@ -80,11 +102,8 @@ def instrument_cmd(cmd):
 
             # If EXT: Wait for system to shutdown then indicate that we no longer are connected to it
             if cmd == 'EXT':
-                start_time = time.time()
-                while time.time() - start_time < timeout:
-                    if not cfg.recv_comms.working:
-                        cfg.indicator.indicator_off()
-                        break
+                if not cfg.recv_comms.working or cfg.recv_comms.closed_event.wait(timeout=timeout):
+                    cfg.indicator.indicator_off()
                 else:
                     messagebox.showerror('Command Error', 'Instrument appears to still be running')
 
@@ -111,6 +130,7 @@ class ConnectionGUI:
         self.port = cfg.sock.port
         self.port_list = None
         self.get_ports('ext_ports')
+        self._probe_future = None       # Future of the most recent connection test
 
         lab = ttk.Label(self.frame, text='IP address:', font=self.main_gui.main_font)
         lab.grid(row=0, column=0, padx=self.pdx, pady=self.pdy, sticky='e')
@@ -167,26 +187,40 @@ class ConnectionGUI:
                 cfg.sock.update_address(host_ip=self.host_ip, port=self.port)
 
     def test_connection(self):
-        """Tests that IP address is available"""
-        # Attempt ping
+        """Tests that IP address is available. The probe runs in a worker thread so the GUI isn't blocked"""
+        # Cancel any probe still waiting to run, so repeated clicks don't queue up
+        if self._probe_future is not None and not self._probe_future.done():
+            self._probe_future.cancel()
+
+        self.connection_label.configure(text='Testing connection...')
+        port = int(cfg.config[ConfigInfo.ssh_port])
+        self._probe_future = _probe_pool.submit(self._probe, self.host_ip, port)
+        self._probe_future.add_done_callback(self._probe_done)
+
+    @staticmethod
+    def _probe(ip, port):
+        """Attempts a TCP connection to the instrument, returning True if successful"""
         try:
-            output = subprocess.check_output(
-                "ping -{} 1 {}".format('n' if platform.system().lower() == "windows" else 'c', self.host_ip),
-                shell=True)
-
-            # If output says host unreachable we flag that there is no connection
-            if b'Destination host unreachable' in output:
-                raise Exception
+            with socket.create_connection((ip, port), timeout=1.0):
+                return True
+        except OSError as e:
+            GuiLogger.error(e)
+            return False
 
-            # Otherwise there must be a connection, so we update our label to say this
-            else:
-                self.connection_label.configure(text='Connection found')
+    def _probe_done(self, future):
+        """Passes probe result back to the Tk thread. Results of cancelled or superseded probes are ignored"""
+        if future.cancelled() or future is not self._probe_future:
+            return
+        self.frame.after(0, self._apply_probe, future.result())
 
-                # Update the connection if we have a good connection
-                self.update_connection()
+    def _apply_probe(self, connected):
+        """Updates connection label with the result of the connection probe"""
+        if connected:
+            self.connection_label.configure(text='Connection found')
 
-        except Exception as e:
-            GuiLogger.error(e)
+            # Update the connection if we have a good connection
+            self.update_connection()
+        else:
             self.connection_label.configure(text='No connection found at this address')
 
 
@@ -208,6 +242,8 @@ class GUICommRecvHandler:
     :param message_wind:    pycam.gui.misc.MessageWindow
         Message window frame, to print received commands to
     """
+    mess_skip_keys = frozenset(('IDN', 'DST'))     # Comms keys not printed to the message window
+
     def __init__(self, recv_comm=cfg.recv_comms, cam_acq=None, spec_acq=None, message_wind=None):
         self.recv_comms = recv_comm
         self.cam_acq = cam_acq
@@ -221,6 +257,7 @@ class GUICommRecvHandler:
 
         # For downloading frames as they come in
         self.ftp_client = None
+        self.data_keys = ['NIA', 'NMA', 'NIB', 'NMB', 'NIS']     # Comms keys notifying of new data on the instrument
 
     def add_widgets(self, **kwargs):
         """Adds widgets to object that may be required for acting on certain received comms (used by pycam_gui)"""
@@ -237,48 +274,54 @@ class GUICommRecvHandler:
     def get_comms(self):
         """Gets received communications from the recv_comms queue and acts on them"""
         while not self.stop.is_set():
-            comm = self.recv_comms.q.get(block=True)
-            GuiLogger.debug(f"GUI incoming comms: {comm}")
-
-            if 'LOG' in comm:
-                # If getting acquisition flags was purpose of comm we update widgets
-                if comm['LOG'] == 1:
-                    if comm['IDN'] in ['CM1', 'CM2']:
-                        self.cam_acq.update_acquisition_parameters(comm)
-                    elif comm['IDN'] == 'SPE':
-                        self.spec_acq.update_acquisition_parameters(comm)
-
-            if "NIA" in comm and self.ftp_client:
-                #  handle notification of new on camera image
-                self.ftp_client.get_data(comm["NIA"])  # the on PNG
-            if "NMA" in comm and self.ftp_client:
-                #  handle notification of new on camera image metadata
-                self.ftp_client.get_data(comm["NMA"])  # the on JSON
-            if "NIB" in comm and self.ftp_client:
-                # handle notification of new off camera image
-                self.ftp_client.get_data(comm["NIB"])  # the off PNG
-            if "NMB" in comm and self.ftp_client:
-                #  handle notification of new off camera image metadata
-                self.ftp_client.get_data(comm["NMB"])  # the off JSON
-            if "NIS" in comm and self.ftp_client:
-                # handle notification of new spectrometer image
-                self.ftp_client.get_data(comm["NIS"])  # the npy
-
-            if "GBY" in comm:
-                # The server is letting us go, tidy up
-                cfg.indicator.sock.close_socket()
-                # Raise the flags to break out of the threads
-                cfg.recv_comms.event.set()
-                cfg.send_comms.event.set()
-                # Set indicator to off
-                cfg.indicator.indicator_off()
-                # Tell the user the server quit
-                messagebox.showinfo('Disconnected', 'The instrument exited.')
-
+            # Use a timeout so that the stop flag is checked even if no comms are arriving
+            try:
+                comms = [self.recv_comms.q.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+
+            # Drain any other comms already waiting, so that data transfers and message window updates are batched
+            while True:
+                try:
+                    comms.append(self.recv_comms.q.get_nowait())
+                except queue.Empty:
+                    break
+
+            data_names = []
             mess = []
-            for id in comm:
-                if id != 'IDN' and id != 'DST':
-                    mess.append('COMM ({}) > {}: {}'.format(comm['IDN'], id, comm[id]))
+            for comm in comms:
+                GuiLogger.debug(f"GUI incoming comms: {comm}")
+
+                if 'LOG' in comm:
+                    # If getting acquisition flags was purpose of comm we update widgets
+                    if comm['LOG'] == 1:
+                        if comm['IDN'] in ['CM1', 'CM2']:
+                            self.cam_acq.update_acquisition_parameters(comm)
+                        elif comm['IDN'] == 'SPE':
+                            self.spec_acq.update_acquisition_parameters(comm)
+
+                # Handle notification of new on/off camera images (PNG) and their metadata (JSON), and new spectra (npy)
+                for key in self.data_keys:
+                    if key in comm:
+                        data_names.append(comm[key])
+
+                if "GBY" in comm:
+                    # The server is letting us go, tidy up
+                    cfg.indicator.sock.close_socket()
+                    # Raise the flags to break out of the threads
+                    cfg.recv_comms.event.set()
+                    cfg.send_comms.event.set()
+                    # Set indicator to off
+                    cfg.indicator.indicator_off()
+                    # Tell the user the server quit
+                    messagebox.showinfo('Disconnected', 'The instrument exited.')
+
+                idn = comm.get('IDN', '?')
+                mess.extend([f'COMM ({idn}) > {key}: {value}' for key, value in comm.items()
+                             if key not in self.mess_skip_keys])
+
+            if data_names and self.ftp_client:
+                self.ftp_client.get_data_batch(data_names)
 
             # # Put comms into string for message window
             # mess = 'Received communication from instrument. IDN: {}\n' \
@@ -287,7 +330,8 @@ class GUICommRecvHandler:
             #     if id != 'IDN':
             #         mess += '{}: {}\n'.format(id, comm[id])
             self.message_wind.add_message(mess)
-    GuiLogger.info("GUI get_comms stopping")
+
+        GuiLogger.info("GUI get_comms stopping")
 
 
 class InstrumentConfiguration:
@@ -319,6 +363,23 @@ class InstrumentConfiguration:
         self.dbx_script = FileLocator.DROPBOX_UPLOAD_SCRIPT
         self.check_run_script = FileLocator.CHECK_RUN
 
+        # Crontab commands don't change once the scripts are defined, so build them once here. The order must match
+        # the times list in update_acq_time(). Python scripts have cron logging added on
+        cron_log = f" >> {FileLocator.CRON_LOG_PI} 2>&1"
+        self.cron_cmds = ('python3 {}'.format(self.start_script) + cron_log,
+                          'python3 {}'.format(self.stop_script) + cron_log,
+                          'python3 {}'.format(self.dark_script) + cron_log,
+                          'bash {}'.format(self.temp_script),
+                          'python3 {}'.format(self.disk_space_script) + cron_log,
+                          'python3 {}'.format(self.free_space_ssd_script) + cron_log,
+                          # 'python3 {}'.format(self.dbx_script) + cron_log,
+                          'python3 {}'.format(self.check_run_script) + cron_log)
+
+        # Names of tk variables read by _snapshot() when updating the schedule
+        self.schedule_vars = ('capt_start_hour', 'capt_start_min', 'capt_stop_hour', 'capt_stop_min',
+                              'dark_capt_hour', 'dark_capt_min', 'temp_logging', 'check_disk_space',
+                              'free_space_ssd_external')
+
     def initiate_variable(self, main_gui):
         """Initiate tkinter variables"""
         self.main_gui = main_gui
@@ -379,114 +440,103 @@ class InstrumentConfiguration:
         frame_cron = tk.LabelFrame(self.frame, text='Scheduled scripts', relief=tk.RAISED, borderwidth=2, font=self.main_gui.main_font)
         frame_cron.grid(row=0, column=1, sticky='nsew', padx=2, pady=2)
 
-        ttk.Label(frame_cron, text='Start pycam (hr:min):', font=self.main_gui.main_font).grid(row=0, column=0, sticky='w', padx=2, pady=2)
-        ttk.Label(frame_cron, text='Stop pycam (hr:min):', font=self.main_gui.main_font).grid(row=1, column=0, sticky='w', padx=2, pady=2)
-
-        hour_start = ttk.Spinbox(frame_cron, textvariable=self._capt_start_hour, from_=00, to=23, increment=1, width=2, font=self.main_gui.main_font)
-        # hour_start.set("{:02d}".format(self.capt_start_hour))
-        hour_start.grid(row=0, column=1, padx=2, pady=2)
-        ttk.Label(frame_cron, text=':', font=self.main_gui.main_font).grid(row=0, column=2, padx=2, pady=2)
-        min_start = ttk.Spinbox(frame_cron, textvariable=self._capt_start_min, from_=00, to=59, increment=1, width=2, font=self.main_gui.main_font)
-        # min_start.set("{:02d}".format(self.capt_start_min))
-        min_start.grid(row=0, column=3, padx=2, pady=2, sticky='w')
-
-        hour_stop = ttk.Spinbox(frame_cron, textvariable=self._capt_stop_hour, from_=00, to=23, increment=1, width=2, font=self.main_gui.main_font)
-        # hour_stop.set("{:02d}".format(self.capt_stop_hour))
-        hour_stop.grid(row=1, column=1, padx=2, pady=2)
-        ttk.Label(frame_cron, text=':', font=self.main_gui.main_font).grid(row=1, column=2, padx=2, pady=2)
-        min_stop = ttk.Spinbox(frame_cron, textvariable=self._capt_stop_min, from_=00, to=59, increment=1, width=2, font=self.main_gui.main_font)
-        # min_stop.set("{:02d}".format(self.capt_stop_min))
-        min_stop.grid(row=1, column=3, padx=2, pady=2, sticky='w')
-
-        # ------------------
-        # Start dark capture
-        # ------------------
-        row = 2
-        lab = ttk.Label(frame_cron, text='Start dark capture (hr:min):', font=self.main_gui.main_font)
-        lab.grid(row=row, column=0, sticky='w', padx=2, pady=2)
-        hour_dark = ttk.Spinbox(frame_cron, textvariable=self._dark_capt_hour, from_=00, to=23, increment=1, width=2, font=self.main_gui.main_font)
-        hour_dark.grid(row=row, column=1, padx=2, pady=2)
-        ttk.Label(frame_cron, text=':', font=self.main_gui.main_font).grid(row=row, column=2, padx=2, pady=2)
-        min_dark = ttk.Spinbox(frame_cron, textvariable=self._dark_capt_min, from_=00, to=59, increment=1, width=2, font=self.main_gui.main_font)
-        min_dark.grid(row=row, column=3, padx=2, pady=2, sticky='w')
-
-        # -------------------
-        # Temperature logging
-        # -------------------
-        row += 1
-        ttk.Label(frame_cron, text='Temperature log [minutes]:', font=self.main_gui.main_font).grid(row=row, column=0, sticky='w', padx=2, pady=2)
-        temp_log = ttk.Spinbox(frame_cron, textvariable=self._temp_logging, from_=0, to=60, increment=1, width=3, font=self.main_gui.main_font)
-        temp_log.grid(row=row, column=1, columnspan=2, sticky='w', padx=2, pady=2)
-        ttk.Label(frame_cron, text='0=no log', font=self.main_gui.main_font).grid(row=row, column=3, sticky='w', padx=2, pady=2)
-
-        # ----------------------------
-        # Check disk space
-        # ----------------------------
-        row += 1
-        ttk.Label(frame_cron, text='Check disk storage [minutes]:', font=self.main_gui.main_font).grid(row=row, column=0, sticky='w', padx=2, pady=2)
-        disk_stor = ttk.Spinbox(frame_cron, textvariable=self._check_disk_space, from_=0, to=60, increment=1, width=3, font=self.main_gui.main_font)
-        disk_stor.grid(row=row, column=1, columnspan=2, sticky='w', padx=2, pady=2)
-        ttk.Label(frame_cron, text='0=disable', font=self.main_gui.main_font).grid(row=row, column=3, sticky='w', padx=2, pady=2)
-
-        # ----------------------------
-        # Check external SSD disk space
-        # ----------------------------
-        row += 1
-        ttk.Label(frame_cron, text='Check external SSD [minutes]:', font=self.main_gui.main_font).grid(row=row, column=0, sticky='w', padx=2, pady=2)
-        disk_stor_ext = ttk.Spinbox(frame_cron, textvariable=self._free_space_ssd_external, from_=0, to=60, increment=1, width=3, font=self.main_gui.main_font)
-        disk_stor_ext.grid(row=row, column=1, columnspan=2, sticky='w', padx=2, pady=2)
-        ttk.Label(frame_cron, text='0=disable', font=self.main_gui.main_font).grid(row=row, column=3, sticky='w', padx=2, pady=2)
+        # Rows of (label, hour variable, minute variable) for scheduled scripts run at a specific time
+        hhmm_rows = [('Start pycam (hr:min):', self._capt_start_hour, self._capt_start_min),
+                     ('Stop pycam (hr:min):', self._capt_stop_hour, self._capt_stop_min),
+                     ('Start dark capture (hr:min):', self._dark_capt_hour, self._dark_capt_min)]
+
+        # Rows of (label, variable, hint) for scheduled scripts run every x minutes
+        minutes_rows = [('Temperature log [minutes]:', self._temp_logging, '0=no log'),
+                        ('Check disk storage [minutes]:', self._check_disk_space, '0=disable'),
+                        ('Check external SSD [minutes]:', self._free_space_ssd_external, '0=disable')]
+
+        row = 0
+        for label, hour_var, min_var in hhmm_rows:
+            self._add_hhmm_row(frame_cron, row, label, hour_var, min_var)
+            row += 1
+        for label, var, hint in minutes_rows:
+            self._add_minutes_row(frame_cron, row, label, var, hint)
+            row += 1
 
         # -------------
         # Update button
         # -------------
-        row += 1
         butt = ttk.Button(frame_cron, text='Update', command=self.update_acq_time)
         butt.grid(row=row, column=0, columnspan=4, sticky='e', padx=2, pady=2)
 
+    def _add_hhmm_row(self, parent, row, label, hour_var, min_var):
+        """Adds a row of widgets for setting a time (hr:min) to parent"""
+        ttk.Label(parent, text=label, font=self.main_gui.main_font).grid(row=row, column=0, sticky='w', padx=2, pady=2)
+        hour = ttk.Spinbox(parent, textvariable=hour_var, from_=00, to=23, increment=1, width=2, font=self.main_gui.main_font)
+        hour.grid(row=row, column=1, padx=2, pady=2)
+        ttk.Label(parent, text=':', font=self.main_gui.main_font).grid(row=row, column=2, padx=2, pady=2)
+        minute = ttk.Spinbox(parent, textvariable=min_var, from_=00, to=59, increment=1, width=2, font=self.main_gui.main_font)
+        minute.grid(row=row, column=3, padx=2, pady=2, sticky='w')
+
+    def _add_minutes_row(self, parent, row, label, var, hint):
+        """Adds a row of widgets for setting a repeat frequency (minutes) to parent"""
+        ttk.Label(parent, text=label, font=self.main_gui.main_font).grid(row=row, column=0, sticky='w', padx=2, pady=2)
+        minutes = ttk.Spinbox(parent, textvariable=var, from_=0, to=60, increment=1, width=3, font=self.main_gui.main_font)
+        minutes.grid(row=row, column=1, columnspan=2, sticky='w', padx=2, pady=2)
+        ttk.Label(parent, text=hint, font=self.main_gui.main_font).grid(row=row, column=3, sticky='w', padx=2, pady=2)
+
+    def _snapshot(self):
+        """Reads all schedule tk variables once, returning a dictionary of their values"""
+        return {name: getattr(self, '_' + name).get() for name in self.schedule_vars}
+
     def update_acq_time(self):
         """Updates acquisition period of instrument"""
+        # Read all tk variables once
+        s = self._snapshot()
+        start_capt_time = self.time_obj(s['capt_start_hour'], s['capt_start_min'])
+        stop_capt_time = self.time_obj(s['capt_stop_hour'], s['capt_stop_min'])
+        start_dark_time = self.time_obj(s['dark_capt_hour'], s['dark_capt_min'])
+
         # Create strings
-        temp_log_str = self.minute_cron_fmt(self.temp_logging)
-        disk_space_str = self.minute_cron_fmt(self.check_disk_space)
-        free_space_ssd_external_str = self.minute_cron_fmt(self.free_space_ssd_external)
+        temp_log_str = self.minute_cron_fmt(s['temp_logging'])
+        disk_space_str = self.minute_cron_fmt(s['check_disk_space'])
+        free_space_ssd_external_str = self.minute_cron_fmt(s['free_space_ssd_external'])
 
-        # Preparation of lists for writing crontab file
-        times = [self.start_capt_time, self.stop_capt_time, self.start_dark_time, temp_log_str, disk_space_str, free_space_ssd_external_str]
-        cmds = ['python3 {}'.format(self.start_script), 'python3 {}'.format(self.stop_script),
-                'python3 {}'.format(self.dark_script), 'bash {}'.format(self.temp_script),
-                'python3 {}'.format(self.disk_space_script), 'python3 {}'.format(self.free_space_ssd_script)]
+        # Preparation of list of times for writing crontab file - must be in the same order as self.cron_cmds
+        times = [start_capt_time, stop_capt_time, start_dark_time, temp_log_str, disk_space_str, free_space_ssd_external_str]
 
-        # Uncomment if we want to run dropbox uploader from crontab
+        # Uncomment if we want to run dropbox uploader from crontab (and add command to self.cron_cmds)
         # dbx_str = self.minute_cron_fmt(60)          # Setup dropbox uploader to run every hour
         # times.append(dbx_str)
-        # cmds.append('python3 {}'.format(self.dbx_script))
 
         # Uncomment if we want to run check_run.py from crontab
         check_run_str = self.minute_cron_fmt(30)          # Setup check_run.py to run every hour
         times.append(check_run_str)
-        cmds.append('python3 {}'.format(self.check_run_script))
-
-        # Add on cron logging
-        cron_log = f" >> {FileLocator.CRON_LOG_PI} 2>&1"
-        cmds = [cmd + cron_log if 'python' in cmd else cmd for cmd in cmds]
 
         # Write crontab file
-        write_script_crontab(FileLocator.SCRIPT_SCHEDULE, cmds, times)
+        write_script_crontab(FileLocator.SCRIPT_SCHEDULE, self.cron_cmds, times)
 
-        # Transfer file to instrument
-        self.ftp.move_file_to_instrument(FileLocator.SCRIPT_SCHEDULE, FileLocator.SCRIPT_SCHEDULE_PI)
+        with open(FileLocator.SCRIPT_SCHEDULE, 'rb') as f:
+            schedule = f.read()
 
         # Pi login details
         uname = cfg.config[ConfigInfo.uname]
         pwd = cfg.config[ConfigInfo.pwd]
         port = cfg.config[ConfigInfo.ssh_port]
 
-        # Setup crontab
-        ssh_cli = open_ssh(self.ftp.host_ip, uname=uname, pwd=pwd, port=port)
+        # Transfer file to instrument and setup crontab in a single SSH channel. The schedule file is written on the
+        # instrument first so that it can be retrieved by retrieve_schedule_files(), and crontab is only updated if
+        # that succeeds - so a failure in either step is reported in the exit status
+        try:
+            with ssh_pool.get_connection(self.ftp.host_ip, uname=uname, pwd=pwd, port=port) as ssh_cli:
+                exit_status = ssh_cmd_stdin(ssh_cli, 'cat > {0} && crontab {0}'.format(FileLocator.SCRIPT_SCHEDULE_PI),
+                                            schedule)
+        except TimeoutError as e:
+            GuiLogger.error(e)
+            messagebox.showerror('Instrument update', 'Timed out updating instrument schedule. Please ensure that the '
+                                                      'instrument is accessible and try again')
+            return
 
-        std_in, std_out, std_err = ssh_cmd(ssh_cli, 'crontab ' + FileLocator.SCRIPT_SCHEDULE_PI, background=False)
-        close_ssh(ssh_cli)
+        if exit_status != 0:
+            GuiLogger.error(f'Crontab update on instrument failed with exit status {exit_status}')
+            messagebox.showerror('Instrument update', 'Failed to update instrument schedule '
+                                                      '(exit status {})'.format(exit_status))
+            return
 
         a = tk.messagebox.showinfo('Instrument update',
                                    'Updated instrument software schedules:\n\n'
@@ -495,18 +545,20 @@ class InstrumentConfiguration:
                                    'Dark capture time: {} UTC\n'
                                    'Log temperature: {} minutes\n'
                                    'Check disk space: {} minutes\n'
-                                   'Check external SSD: {} minutes'.format(self.start_capt_time.strftime('%H:%M'),
-                                                                         self.stop_capt_time.strftime('%H:%M'),
-                                                                         self.start_dark_time.strftime('%H:%M'),
-                                                                         self.temp_logging,
-                                                                         self.check_disk_space,
-                                                                         self.free_space_ssd_external))
+                                   'Check external SSD: {} minutes'.format(start_capt_time.strftime('%H:%M'),
+                                                                         stop_capt_time.strftime('%H:%M'),
+                                                                         start_dark_time.strftime('%H:%M'),
+                                                                         s['temp_logging'],
+                                                                         s['check_disk_space'],
+                                                                         s['free_space_ssd_external']))
 
         self.frame.attributes('-topmost', 1)
         self.frame.attributes('-topmost', 0)
 
-    def minute_cron_fmt(self, minutes):
-        """Creates the correct string for the crontab based on the minutes provided"""
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def minute_cron_fmt(minutes):
+        """Creates the correct string for the crontab based on the minutes provided (only 0-60 are used, so cached)"""
         # Some initial organising for the temperature logging
         if minutes == 0:
             log_str = '#* * * * *'     # Script is turned off
@@ -520,20 +572,25 @@ class InstrumentConfiguration:
         self.in_frame = False
         self.frame.destroy()
 
+    @staticmethod
+    def time_obj(hour, minute):
+        """Return datetime object of time. Date is not important, only time, so use arbitrary date"""
+        return datetime.datetime(year=2020, month=1, day=1, hour=hour, minute=minute)
+
     @property
     def start_capt_time(self):
         """Return datetime object of time to turn start acq. Date is not important, only time, so use arbitrary date"""
-        return datetime.datetime(year=2020, month=1, day=1, hour=self.capt_start_hour, minute=self.capt_start_min)
+        return self.time_obj(self.capt_start_hour, self.capt_start_min)
 
     @property
     def stop_capt_time(self):
         """Return datetime object of time to turn stop acq. Date is not important, only time, so use arbitrary date"""
-        return datetime.datetime(year=2020, month=1, day=1, hour=self.capt_stop_hour, minute=self.capt_stop_min)
+        return self.time_obj(self.capt_stop_hour, self.capt_stop_min)
 
     @property
     def start_dark_time(self):
         """Return datetime object of time to turn start acq. Date is not important, only time, so use arbitrary date"""
-        return datetime.datetime(year=2020, month=1, day=1, hour=self.dark_capt_hour, minute=self.dark_capt_min)
+        return self.time_obj(self.dark_capt_hour, self.dark_capt_min)
 
     @property
     def on_hour(self):
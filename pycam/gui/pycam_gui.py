@@ -19,6 +19,7 @@ from pycam.gui.cfg_menu_frames import geom_settings, process_settings, plume_bg,
 import pycam.gui.cfg as cfg
 from pycam.cfg import pyplis_worker
 from pycam.doas.cfg import doas_worker
+from pycam.logging.logging_tools import LoggerManager
 
 import tkinter as tk
 import tkinter.ttk as ttk
@@ -166,6 +167,8 @@ class PyCam(ttk.Frame):
 
 
 def run_GUI():
+    LoggerManager.configure_root()
+
     padx = 0
     pady = 0
     root = tk.Tk()
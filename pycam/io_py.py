@@ -8,23 +8,43 @@ from .setupclasses import SpecSpecs, CameraSpecs, FileLocator
 from .utils import check_filename
 import numpy as np
 import os
+import functools
+import shutil
+import subprocess
+import atexit
+import collections
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import datetime
 from datetime import datetime as dt
-import time
 import json
+import re
 from tkinter import filedialog
 try:
     import RPi.GPIO as GPIO
 except ImportError:
     pass
 from tkinter import filedialog
-from pandas import DataFrame
+from pandas import DataFrame, read_csv
 from pathlib import Path
 
 from pycam.logging.logging_tools import LoggerManager
 
 pycamLogger = LoggerManager.add_logger("Pycam")
 
+
+@functools.cache
+def _camera_specs():
+    """Default camera specs, built once since constructing CameraSpecs reads its config file from disk"""
+    return CameraSpecs()
+
+
+@functools.cache
+def _spec_specs():
+    """Default spectrometer specs, built once since constructing SpecSpecs reads its config file from disk"""
+    return SpecSpecs()
+
 try:
     from pyplis import LineOnImage
     from pyplis.fluxcalc import EmissionRates
@@ -32,12 +52,96 @@ try:
 except ImportError:
     pycamLogger.warning('Working on a machine without pyplis. Processing will not be possible')
 
+try:
+    import blosc2
+except ImportError:
+    blosc2 = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+try:
+    import hdf5plugin
+except ImportError:
+    hdf5plugin = None
+
 try:
     import cv2
 except ModuleNotFoundError:
     pycamLogger.warning('OpenCV could not be imported, there may be some issues caused by this')
 
-def save_img(img, filename, file_ext='.png', metadata=None, meta_filename=None, meta_ext='.json', compression=False):
+def _write_atomic(filename, write_func):
+    """
+    Writes a file under a temporary .part name and renames it into place once complete, so anything watching the
+    directory only ever sees finished files. Replaces the older .lock file protocol
+    :param filename:    str         Final file path
+    :param write_func:  callable    Called with the open binary file object to write the data
+    """
+    tmp_filename = filename + '.part'
+    try:
+        f = open(tmp_filename, 'wb')
+    except FileNotFoundError:
+        # Folder has been removed since it was made (e.g. when freeing disk space), so make it again
+        _created_dirs.discard(os.path.dirname(filename))
+        _make_parent_dir(filename)
+        f = open(tmp_filename, 'wb')
+    with f:
+        write_func(f)
+    os.replace(tmp_filename, filename)
+
+
+# Folders already made by _make_parent_dir(), so that a stream of images saved to the same folder doesn't need a
+# mkdir call for each one
+_created_dirs = set()
+
+
+def _make_parent_dir(filename):
+    """Makes sure the folder of filename exists"""
+    directory = os.path.dirname(filename)
+    if directory not in _created_dirs:
+        os.makedirs(directory or '.', exist_ok=True)
+        _created_dirs.add(directory)
+
+
+def _dump_metadata(metadata):
+    """Serialises image metadata to JSON bytes, using the much faster orjson encoder if it is installed"""
+    if orjson is not None:
+        return orjson.dumps(metadata, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(metadata, indent=4).encode()
+
+
+def encode_img(img, file_ext='.png', compression=False):
+    """
+    Encodes image in memory, ready to be written to file by save_img
+    :param img:         np.array    Image array to be encoded
+    :param file_ext:    str         Image format, including "."
+    :param compression: bool        If True, PNG compression is used
+    :return: np.array               Encoded image bytes
+    """
+    # Level 0 is no faster than OpenCV's own defaults (libpng still runs its filters) and gives files twice the size, so
+    # the defaults are used when compression isn't requested. Level 1 with run-length encoding compresses as well as
+    # level 5 at around a third of the cost
+    if compression:
+        params = [cv2.IMWRITE_PNG_COMPRESSION, 1, cv2.IMWRITE_PNG_STRATEGY, cv2.IMWRITE_PNG_STRATEGY_RLE]
+    else:
+        params = []
+
+    success, buf = cv2.imencode(file_ext, img, params)
+    if not success:
+        # failed to save!
+        raise IOError("Failed to save PNG!")
+    return buf
+
+
+def save_img(img, filename, file_ext='.png', metadata=None, meta_filename=None, meta_ext='.json', compression=False,
+             encoded=None):
     """Saves image
     img: np.array
         Image array to be saved
@@ -45,35 +149,121 @@ def save_img(img, filename, file_ext='.png', metadata=None, meta_filename=None,
         File path for saving
     file_ext: str
         File extension for saving, including "."
+    encoded: np.array
+        Image already encoded by encode_img() - used when saving the same image to several locations so that it is
+        only encoded once
     """
-    Path(filename).parent.mkdir(parents=True, exist_ok=True)  # make sure the folder exists
-    # Create lock file to secure file until saving is complete
-    lock = filename.replace(file_ext, '.lock')
-    open(lock, 'a').close()
+    _make_parent_dir(filename)  # make sure the folder exists
 
-    if compression:
-        png_compression = 5
-    else:
-        png_compression = 0
+    # Save metadata first, so it is already in place when the image appears
+    if metadata and meta_filename:
+        _write_atomic(meta_filename, lambda f: f.write(_dump_metadata(metadata)))
+        pycamLogger.info(f"Saved {meta_filename}")
 
     # Save image
-    success = cv2.imwrite(filename, img, [cv2.IMWRITE_PNG_COMPRESSION, png_compression])
-    if not success:
-        # failed to save!
-        raise IOError("Failed to save PNG!")
+    if encoded is None:
+        encoded = encode_img(img, file_ext, compression)
+    _write_atomic(filename, lambda f: f.write(encoded))
     pycamLogger.info(f"Saved {filename}")
 
-    # Save metadata
-    if metadata and meta_filename:
-        with open(meta_filename, "w") as f:
-            json.dump(metadata, f, indent=4)
-        pycamLogger.info(f"Saved {meta_filename}")
+    return filename
+
 
-    # Remove lock to free image for transfer
-    os.remove(lock)
+def save_img_fast(img, filename, metadata=None):
+    """
+    Saves image as raw numpy data with its metadata embedded, as a faster alternative to save_img for high rate
+    acquisition. Skips PNG encoding and the separate metadata file, writing a single uncompressed .npz archive. The
+    file is written under a temporary name and renamed into place, so it is complete as soon as it exists.
+    :param img:         np.array    Image array to be saved
+    :param filename:    str         File path for saving (.npz)
+    :param metadata:    dict        JSON serialisable metadata stored alongside the image
+    """
+    _make_parent_dir(filename)  # make sure the folder exists
+    _write_atomic(filename, lambda f: np.savez(f, img=img, meta=np.array(json.dumps(metadata or {}))))
+    pycamLogger.info(f"Saved {filename}")
     return filename
 
 
+def load_img_fast(filename):
+    """
+    Loads image saved by save_img_fast
+    :param filename:    str     File path of .npz image
+    :return: (np.array, dict)   Image and its metadata
+    """
+    with np.load(filename, allow_pickle=False) as data:
+        return data['img'], json.loads(str(data['meta']))
+
+
+class H5ImageWriter:
+    """
+    Saves images to a single HDF5 file for a whole acquisition session, one dataset per image with its metadata held as
+    a dataset attribute. Replaces the PNG + JSON files per image with compressed chunks appended to one file. Each
+    image is compressed with byte shuffle + LZ4 (via hdf5plugin), falling back to h5py's built-in LZF filter
+    :param filename:    str     Path of HDF5 file (appended to if it already exists)
+    """
+    def __init__(self, filename):
+        if h5py is None:
+            raise ImportError('h5py is required to save images to HDF5')
+        Path(filename).parent.mkdir(parents=True, exist_ok=True)  # make sure the folder exists
+        self.filename = filename
+        self._file = h5py.File(filename, 'a')
+        if hdf5plugin is not None:
+            self._filters = dict(shuffle=True, **hdf5plugin.LZ4())
+        else:
+            self._filters = dict(shuffle=True, compression='lzf')
+
+    def save(self, img, name, metadata=None):
+        """
+        Saves image as a new dataset, chunked as a single frame
+        :param img:         np.array    Image array to be saved
+        :param name:        str         Dataset name (e.g. image filename without extension)
+        :param metadata:    dict        JSON serialisable image metadata
+        """
+        dataset = self._file.create_dataset(name, data=img, chunks=img.shape, **self._filters)
+        dataset.attrs['metadata'] = _dump_metadata(metadata or {}).decode()
+        self._file.flush()
+        pycamLogger.info(f"Saved {name} to {self.filename}")
+
+    def load(self, name):
+        """
+        Loads image and metadata saved under name
+        :return: (np.array, dict)
+        """
+        dataset = self._file[name]
+        return dataset[()], json.loads(dataset.attrs['metadata'])
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+_spec_buffers = {}
+_spec_buffers_lock = threading.Lock()
+
+
+@contextmanager
+def _spec_buffer(wavelengths, spectrum):
+    """
+    Packs wavelengths and spectrum into a reusable 2xN buffer, avoiding a new allocation for every spectrum saved.
+    Buffers are cached by length and dtype, which is fixed for a given spectrometer
+    """
+    wavelengths = np.asarray(wavelengths)
+    spectrum = np.asarray(spectrum)
+    key = (wavelengths.size, np.result_type(wavelengths, spectrum))
+    with _spec_buffers_lock:
+        buf = _spec_buffers.get(key)
+        if buf is None:
+            buf = _spec_buffers[key] = np.empty((2, key[0]), dtype=key[1])
+        buf[0] = wavelengths
+        buf[1] = spectrum
+        yield buf
+
+
 def save_spectrum(wavelengths, spectrum, filename, file_ext=None):
     """Saves spectrum as numpy .mat file
     wavelengths: NumPy array-like object
@@ -82,55 +272,140 @@ def save_spectrum(wavelengths, spectrum, filename, file_ext=None):
         Spectrum digital numbers held in array
     filename: str
         File path for saving
+    file_ext: str
+        No longer used (previously defined the lock file name), kept for compatibility
     """
-    Path(filename).parent.mkdir(parents=True, exist_ok=True)  # make sure the folder exists
-    # Create lock file to secure file until saving is complete
-    if not file_ext:
-        # read in config again to get extension if one's not provided
-        file_ext = SpecSpecs().file_ext
-    lock = filename.replace(file_ext, '.lock')
-    open(lock, 'a').close()
-
-    # Pack wavelengths and spectrum into single array
-    spec_array = np.array([wavelengths, spectrum])
+    _make_parent_dir(filename)  # make sure the folder exists
 
-    # Save spectrum
-    np.save(filename, spec_array)
+    # Save spectrum (np.save appends .npy, so keep the same file naming)
+    if not filename.endswith('.npy'):
+        filename += '.npy'
+    with _spec_buffer(wavelengths, spectrum) as spec_array:
+        _write_atomic(filename, lambda f: np.lib.format.write_array(f, spec_array, allow_pickle=False))
     pycamLogger.info(f"Saved {filename}")
 
-    # Remove lock
-    os.remove(lock)
     return filename
 
 
-def load_spectrum(filename, attempts = 3):
+def load_spectrum(filename, attempts=None):
     """Essentially a wrapper to numpy load function, with added filename check
     :param  filename:   str     Full path of spectrum to be loaded
-    :param  attempts:   int     Number of attempts to load the spectrum
+    :param  attempts:   int     No longer used (spectra are renamed into place once complete, so there is no partially
+                                written file to retry on), kept for compatibility
     """
 
     try:
-        check_filename(filename, SpecSpecs().file_ext.split('.')[-1])
+        check_filename(filename, _spec_specs().file_ext.split('.')[-1])
     except:
         raise
 
-    while attempts > 0:
-        try:
-            spec_array = np.load(filename)
-        except PermissionError as e:
-            time.sleep(0.2)
-            attempts -= 1
-            err = e
-        else:
-            break
-    else:
-        raise err
+    # Spectra are always .npy, so read the array directly rather than having np.load sniff the file type
+    with open(filename, 'rb') as f:
+        spec_array = np.lib.format.read_array(f, allow_pickle=False)
 
     wavelengths = spec_array[0, :]
     spectrum = spec_array[1, :]
     return wavelengths, spectrum
 
 
+@functools.cache
+def ffmpeg_encoder_available(encoder):
+    """
+    Checks whether ffmpeg is installed and can actually encode with the requested encoder (e.g. hardware encoders are
+    often compiled in but unusable without the right GPU/driver, so we test encode a few blank frames)
+    :param encoder: str     ffmpeg encoder name, e.g. 'h264_nvenc'
+    """
+    if shutil.which('ffmpeg') is None:
+        return False
+    cmd = ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-f', 'lavfi', '-i', 'color=black:s=256x256:d=0.1',
+           '-c:v', encoder, '-f', 'null', '-']
+    try:
+        return subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=10).returncode == 0
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+
+class FFmpegVideoWriter:
+    """
+    Writes 8-bit greyscale frames to a video by piping raw frames to an ffmpeg subprocess. Has the same
+    write()/release() interface as cv2.VideoWriter so it can be used in its place
+    :param filename:        str     Video file to write
+    :param fps:             int     Frame rate of video
+    :param frame_size:      tuple   (width, height) of frames
+    :param encoder_args:    list    ffmpeg output arguments defining the encoder
+    """
+    def __init__(self, filename, fps, frame_size, encoder_args):
+        cmd = ['ffmpeg', '-y', '-hide_banner', '-loglevel', 'error',
+               '-f', 'rawvideo', '-pix_fmt', 'gray', '-s', '{}x{}'.format(*frame_size), '-r', str(fps), '-i', '-',
+               *encoder_args, '-pix_fmt', 'yuv420p', filename]
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, bufsize=frame_size[0] * frame_size[1] * 4)
+
+    def write(self, img):
+        """Write a single uint8 frame"""
+        self.proc.stdin.write(np.ascontiguousarray(img).data)
+
+    def release(self):
+        """Finish writing video, waiting for ffmpeg to flush the file"""
+        self.proc.stdin.close()
+        if self.proc.wait() != 0:
+            raise IOError(f'ffmpeg failed writing video (exit status {self.proc.returncode})')
+
+
+def open_video_writer(videoname, fps, frame_size):
+    """
+    Returns a video writer for 8-bit greyscale frames. Uses NVENC hardware encoding through ffmpeg if it is available,
+    then ffmpeg's multi-threaded libx264 software encoder, and finally falls back to OpenCV's mp4v writer
+    :param videoname:   str     Video file to write
+    :param fps:         int     Frame rate of video
+    :param frame_size:  tuple   (width, height) of frames
+    """
+    if ffmpeg_encoder_available('h264_nvenc'):
+        pycamLogger.info('Writing video with ffmpeg using NVENC hardware encoding')
+        return FFmpegVideoWriter(videoname, fps, frame_size, ['-c:v', 'h264_nvenc', '-preset', 'p4', '-b:v', '4M'])
+    if ffmpeg_encoder_available('libx264'):
+        pycamLogger.info('Writing video with ffmpeg using libx264')
+        return FFmpegVideoWriter(videoname, fps, frame_size,
+                                 ['-c:v', 'libx264', '-preset', 'ultrafast', '-tune', 'fastdecode'])
+
+    # fourcc = cv2.VideoWriter_fourcc(*'DIVX')
+    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+    return cv2.VideoWriter(videoname, fourcc, fps, frame_size, 0)
+
+
+_digits_to_zero = str.maketrans('0123456789', '0000000000')
+
+
+@functools.lru_cache(maxsize=16)
+def _video_label_size(label_template, font, font_scale):
+    """Text size of a frame label. Hershey digits all share one width, so labels are cached with digits zeroed"""
+    text_size, _ = cv2.getTextSize(label_template, font, font_scale, 1)
+    return text_size
+
+
+def _load_video_frame(file_path, label, alpha, out=None):
+    """
+    Loads an image and converts it to an annotated 8-bit video frame
+    :param file_path: str   Path to image
+    :param label: str       Text written in the top left of the frame
+    :param alpha: float     Scale factor to convert image to 8-bit
+    :param out: np.ndarray  Optional uint8 buffer to write the frame into (reallocated by OpenCV if the shape differs)
+    :return: np.ndarray     uint8 frame
+    """
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    font_scale = 0.5
+    pos = (15, 20)
+    colour = (255, 255, 255)
+    colour_bg = (0, 0, 0)
+
+    img = cv2.convertScaleAbs(cv2.imread(file_path, -1), dst=out, alpha=alpha)
+
+    # Write label to frame. Filenames in a sequence only differ by digits, so their text size is only computed once
+    text_w, text_h = _video_label_size(label.translate(_digits_to_zero), font, font_scale)
+    cv2.rectangle(img, pos, (pos[0] + text_w, pos[1] + int(text_h*1.5)), colour_bg, -1)
+    cv2.putText(img, label, (pos[0], int(pos[1] + text_h + font_scale - 1)), font, font_scale, colour, 1, cv2.LINE_4)
+    return img
+
+
 def create_video(directory=None, band='on', save_dir=None, fps=60, overwrite=True):
     """
     Generates video from image sequence.
@@ -145,9 +420,15 @@ def create_video(directory=None, band='on', save_dir=None, fps=60, overwrite=Tru
     cam_spec = CameraSpecs()
     band_str = cam_spec.file_filterids[band]
 
-    # Get all data
-    data = [x for x in os.listdir(directory) if cam_spec.file_ext in x]
-    band_files = [x for x in data if x.split('_')[cam_spec.file_fltr_loc] == band_str]
+    # Get all images for this band in a single pass over the directory
+    file_ext = cam_spec.file_ext
+    fltr_loc = cam_spec.file_fltr_loc
+    band_files = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.endswith(file_ext) and name.split('_')[fltr_loc] == band_str:
+                band_files.append(name)
     band_files.sort()
     num_frames = len(band_files)
 
@@ -167,53 +448,69 @@ def create_video(directory=None, band='on', save_dir=None, fps=60, overwrite=Tru
             return
 
     # Setup video writer object
-    # fourcc = cv2.VideoWriter_fourcc(*'DIVX')
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(videoname, fourcc, fps, frame_size, 0)
-    font = cv2.FONT_HERSHEY_SIMPLEX
-    font_scale = 0.5
-    pos = (15, 20)
-    colour = (255,255,255)
-    colour_bg = (0,0,0)
-
-    # Loop through image files, loading them then writing them to the video object
-    for i, filename in enumerate(band_files):
-        if i % 50 == 0:
-            pycamLogger.info(f'Writing frame {i+1} of {num_frames}')
-        file_path = os.path.join(directory, filename)
-        img = np.array(cv2.imread(file_path, -1))
-        img = np.round((img / ((2**cam_spec.bit_depth)-1) * 255))
-        img = np.array(img, dtype=np.uint8)
-
-        # Write filename to frame
-        text_size, _ = cv2.getTextSize(filename, font, font_scale, 1)
-        text_w, text_h = text_size
-        cv2.rectangle(img, pos, (pos[0] + text_w, pos[1] + int(text_h*1.5)), colour_bg, -1)
-        cv2.putText(img, filename, (pos[0], int(pos[1] + text_h + font_scale - 1)), font, font_scale, colour, 1, cv2.LINE_4)
-
-        # Add frame to video
-        out.write(img)
+    out = open_video_writer(videoname, fps, frame_size)
+
+    # Scale factor from camera bit depth to 8-bit
+    alpha = 255.0 / ((2**cam_spec.bit_depth) - 1)
+
+    # Frames are loaded, rescaled and annotated on worker threads (OpenCV releases the GIL) while this
+    # thread feeds the encoder. One worker per core, and only prefetch frames are held in memory at once
+    workers = os.cpu_count() or 4
+    prefetch = min(4 * workers, 32)
+    pending = collections.deque()
+    frame_num = 0
+
+    # Frames are scaled into a ring of reusable buffers. A slot is only reused once its previous frame has been written,
+    # since at most prefetch frames are ever pending
+    buffers = [np.empty(frame_size[::-1], dtype=np.uint8) for _ in range(min(prefetch, num_frames))]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for i, filename in enumerate(band_files):
+            pending.append(executor.submit(_load_video_frame, os.path.join(directory, filename), filename, alpha,
+                                           buffers[i % len(buffers)]))
+
+            # Write oldest frame once the prefetch queue is full, or flush everything after the final submission
+            while len(pending) >= prefetch or (pending and i == num_frames - 1):
+                if frame_num % 50 == 0:
+                    pycamLogger.info(f'Writing frame {frame_num+1} of {num_frames}')
+                out.write(pending.popleft().result())
+                frame_num += 1
 
     out.release()
     pycamLogger.info(f'Video write completed: {videoname}')
 
 
-def spec_txt_2_npy(directory):
-    """Generates numpy arrays of spectra text files (essentially compressing them)"""
+def _spec_txt_2_npy_file(txt_path):
+    """Converts a single spectrum text file to a numpy array file alongside it"""
+    try:
+        # pandas C parser is much faster than np.loadtxt for numeric text (round_trip keeps values bit-identical)
+        spec = read_csv(txt_path, sep=r'\s+', header=None, comment='#', engine='c', dtype=np.float64,
+                        float_precision='round_trip').to_numpy()
+        wavelengths = spec[:, 0]
+        spectrum = spec[:, 1]
+
+        directory, file = os.path.split(txt_path)
+        save_spectrum(wavelengths, spectrum, os.path.join(directory, file.replace('txt', 'npy')))
+    except BaseException:
+        pycamLogger.error(f'Error converting {txt_path} from .txt to .npy. '
+                          f'It may not be in the expected format')
+
+
+def spec_txt_2_npy(directory, workers=None):
+    """
+    Generates numpy arrays of spectra text files (essentially compressing them)
+    :param directory:   str     Directory containing spectra text files
+    :param workers:     int     Number of processes to convert files with (defaults to the number of CPUs)
+    """
 
     # List all text files
-    txt_files = [f for f in os.listdir(directory) if '.txt' in f]
+    txt_files = [directory + f for f in os.listdir(directory) if '.txt' in f]
 
-    for file in txt_files:
-        try:
-            spec = np.loadtxt(directory + file)
-            wavelengths = spec[:, 0]
-            spectrum = spec[:, 1]
+    # Each file is independent, so spread the conversion over processes
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(_spec_txt_2_npy_file, txt_files, chunksize=16))
 
-            save_spectrum(wavelengths, spectrum, directory + file.replace('txt', 'npy'))
-        except BaseException:
-            pycamLogger.error(f'Error converting {flie} from .txt to .npy. '
-                              f'It may not be in the expected format')
+
+_key_val_pattern = re.compile(r'^\s*(\w+)=(.*)$', re.MULTILINE)
 
 
 def save_pcs_line(line, filename):
@@ -223,10 +520,11 @@ def save_pcs_line(line, filename):
     :param filename:    str
     :return:
     """
+    # Kept as key=value text (read back by load_pcs_line in a single scan) so previously saved lines still load
     with open(filename, 'w') as f:
-        f.write('x={},{}\n'.format(int(np.round(line.x0)), int(np.round(line.x1))))
-        f.write('y={},{}\n'.format(int(np.round(line.y0)), int(np.round(line.y1))))
-        f.write('orientation={}\n'.format(line.normal_orientation))
+        f.write('x={},{}\ny={},{}\norientation={}\n'.format(int(np.round(line.x0)), int(np.round(line.x1)),
+                                                           int(np.round(line.y0)), int(np.round(line.y1)),
+                                                           line.normal_orientation))
 
 
 def load_pcs_line(filename, color='blue', line_id='line'):
@@ -239,20 +537,15 @@ def load_pcs_line(filename, color='blue', line_id='line'):
         pycamLogger.warning(f'Cannot get line from filename: {filename} as no file exists at this path')
         return
 
-    pcs_line_type = None
-
+    # Pull all key=value pairs out of the file in a single scan
     with open(filename, 'r') as f:
-        for line in f:
-            if 'x=' in line:
-                coords = line.split('x=')[-1].strip()
-                x0, x1 = [int(x) for x in coords.split(',')]
-            elif 'y=' in line:
-                coords = line.split('y=')[-1].strip()
-                y0, y1 = [int(y) for y in coords.split(',')]
-            elif 'orientation=' in line:
-                orientation = line.split('orientation=')[-1].strip()
-            elif 'type=' in line:
-                pcs_line_type = line.split('type=')[-1].split('\n')[0]
+        pairs = dict((key, val.strip()) for key, val in _key_val_pattern.findall(f.read()))
+
+    x0, x1 = [int(x) for x in pairs['x'].split(',')]
+    y0, y1 = [int(y) for y in pairs['y'].split(',')]
+    orientation = pairs['orientation']
+    pcs_line_type = pairs.get('type')
+
     pcs_line = LineOnImage(x0=x0, y0=y0, x1=x1, y1=y1,
                            normal_orientation=orientation,
                            color=color,
@@ -271,34 +564,30 @@ def load_light_dil_line(filename, color='blue', line_id='line'):
     line, _ = load_pcs_line(filename, color, line_id)
     return line
 
-def load_picam_png(file_path, meta={}, attempts=3, **kwargs):
-    """Load PiCam png files and import meta information"""
+_path_sep_pattern = re.compile(r'[\\/]')
+_picam_ss_pattern = re.compile(r'_(\d+)ss')
 
-    while attempts > 0:
-        raw_img = cv2.imread(file_path, cv2.IMREAD_UNCHANGED)
 
-        # Image successfully loaded
-        if raw_img is not None:
-            break
-    
-        # cv2 returns None if file failed to load
-        if raw_img is None:
-            time.sleep(0.2)
-            attempts -= 1
-    else:
-        raise FileNotFoundError(f"Image from {file_path} could not be loaded.") 
+def load_picam_png(file_path, meta={}, **kwargs):
+    """Load PiCam png files and import meta information"""
+    # Images are renamed into place once fully written, so a failed load won't succeed on retrying.
+    # cv2 returns None if file failed to load
+    raw_img = cv2.imread(file_path, cv2.IMREAD_UNCHANGED)
+    if raw_img is None:
+        raise FileNotFoundError(f"Image from {file_path} could not be loaded.")
 
-    img = np.array(raw_img)
+    # cv2.imread already returns a new ndarray, so no copy is needed
+    img = raw_img
 
     # Split both forward and backward slashes, to account for both formats
-    file_name = file_path.split('\\')[-1].split('/')[-1]
+    file_name = _path_sep_pattern.split(file_path)[-1]
 
     # Update metadata dictionary
     meta["bit_depth"] = 10
     meta["device_id"] = "picam-1"
     meta["file_type"] = "png"
-    meta["start_acq"] = dt.strptime(file_name.split('_')[0], "%Y-%m-%dT%H%M%S")
-    meta["texp"] = float([f for f in file_name.split('_') if 'ss' in f][0].replace('ss', '')) * 10 ** -6  # exposure in seconds
+    meta["start_acq"] = dt.strptime(file_name.split('_', 1)[0], "%Y-%m-%dT%H%M%S")
+    meta["texp"] = int(_picam_ss_pattern.search(file_name).group(1)) * 10 ** -6  # exposure in seconds
     meta["read_gain"] = 1
     meta["pix_width"] = meta["pix_height"] = 5.6e-6  # pixel width in m
 
@@ -320,6 +609,34 @@ def load_fov_txt(filename):
     pass
 
 
+def save_b2nd(full_path, arr):
+    """
+    Saves array as a Blosc2 compressed .b2nd file. Byte shuffle with fast LZ4 compression works well on float images
+    :param full_path:   str         Full path of file to save
+    :param arr:         np.ndarray  Array to be saved
+    """
+    blosc2.asarray(np.ascontiguousarray(arr), urlpath=full_path, mode='w',
+                   cparams={'codec': blosc2.Codec.LZ4, 'clevel': 1, 'filters': [blosc2.Filter.SHUFFLE]})
+
+
+def _save_mat(full_path, arr):
+    """Saves array uncompressed as the 'img' variable of a MATLAB file"""
+    scipy.io.savemat(full_path, {'img': arr}, do_compression=False, appendmat=False, oned_as='row', format='5')
+
+
+def _save_npy(full_path, arr):
+    """Saves array as a numpy .npy file"""
+    np.save(full_path, arr, allow_pickle=False)
+
+
+# Accepted save types for save_so2_img_raw(). FITS files are saved by pyplis itself
+_so2_raw_save_funcs = {'.mat': _save_mat,
+                       '.npy': _save_npy,
+                       '.fts': None}
+if blosc2 is not None:
+    _so2_raw_save_funcs['.b2nd'] = save_b2nd
+
+
 def save_so2_img_raw(path, img, filename=None, img_end='cal', ext='.mat'):
     """
     Saves tau or calibrated image. Saves the raw_data
@@ -327,24 +644,19 @@ def save_so2_img_raw(path, img, filename=None, img_end='cal', ext='.mat'):
     :param img:         Img     pyplis.Img object to be saved
     :param filename:    str     Filename to be saved. If None, fielname is determined from meta data of Img
     :param img_end:     str     End of filename - describes the type of file
-    :param ext:         str     File extension (takes .mat, .npy, .fts)
+    :param ext:         str     File extension (takes .mat, .npy, .fts, and .b2nd if blosc2 is installed)
     """
-    # Define accepted save types
-    save_funcs = {'.mat': scipy.io.savemat,
-                  '.npy': np.save,
-                  '.fts': None}
-
     if filename is not None:
         ext = '.' + filename.split('.')[-1]
 
     # Check we have a valid filename
-    if ext not in save_funcs:
+    if ext not in _so2_raw_save_funcs:
         pycamLogger.warning('Unrecognised file extension for saving SO2 image. Image will not be saved')
         return
 
     if filename is None:
         # Put time into a string
-        time_str = img.meta['start_acq'].strftime(CameraSpecs().file_datestr)
+        time_str = img.meta['start_acq'].strftime(_camera_specs().file_datestr)
 
         filename = '{}_{}{}'.format(time_str, img_end, ext)
 
@@ -356,29 +668,29 @@ def save_so2_img_raw(path, img, filename=None, img_end='cal', ext='.mat'):
         if os.path.exists(full_path):
             pycamLogger.info(f'Overwriting file to save image: {full_path}')
 
-        # If we are saving as a matlab file we need to make a dictionary to save for the scipy.io.savemat argument
-        if ext == '.mat':
-            save_obj = {'img': img.img}
-        else:
-            save_obj = img.img
-
         # SAVE IMAGE
-        save_funcs[ext](full_path, save_obj)
+        _so2_raw_save_funcs[ext](full_path, img.img)
 
 
-def save_so2_img(path, img, filename=None, compression=0, max_val=None):
+def save_so2_img(path, img, filename=None, compression=0, max_val=None, file_ext='.png', quality=90):
     """
-    Scales image and saves as am 8-bit PNG image - for easy viewing. No data integrity is saved with this function
+    Scales image and saves as an 8-bit image (PNG by default) - for easy viewing. No data integrity is saved with this
+    function
     :param path:    str             Path to directory to save image
     :param img:     pyplis.Img
-    :param compression:     int     Compression of PNG (0-9)
+    :param compression:     int     Compression of PNG (1-9, 0 uses fast OpenCV defaults)
     :param max_val:  float/int      Maximum value of image to normalise to
+    :param file_ext: str            Image format ('.png', or lossy '.jpg'/'.webp' which encode faster and smaller)
+    :param quality:  int            Quality of lossy formats (0-100)
+    :return: concurrent.futures.Future  Completes once the image has been written to disk
     """
     if filename is None:
         # Put time into a string
-        time_str = img.meta['start_acq'].strftime(CameraSpecs().file_datestr)
+        time_str = img.meta['start_acq'].strftime(_camera_specs().file_datestr)
 
-        filename = '{}_SO2_img.png'.format(time_str)
+        filename = '{}_SO2_img{}'.format(time_str, file_ext)
+    else:
+        file_ext = os.path.splitext(filename)[-1]
     full_path = os.path.join(path, filename)
     if os.path.exists(full_path):
         pycamLogger.info(f'Overwriting file to save image: {full_path}')
@@ -386,15 +698,77 @@ def save_so2_img(path, img, filename=None, compression=0, max_val=None):
     # Scale image and convert to 8-bit
     if max_val is None:
         max_val = np.nanmax(img.img)
-    arr = img.img
-    arr[arr > max_val] = max_val
-    arr[arr < 0] = 0
-    im2save = np.array((arr / max_val) * 255, dtype=np.uint8)
+    # Clip into a new array (leaving the image itself unmodified), then scale and cast in one convertScaleAbs pass.
+    # Clipping must come first: convertScaleAbs takes the absolute value of negatives and maps inf to 0
+    alpha = 255.0 / max_val if max_val > 0 else 0
+    im2save = cv2.convertScaleAbs(np.clip(img.img, 0, max_val), alpha=alpha)
+
+    # Set compression value
+    if file_ext in ('.jpg', '.jpeg'):
+        params = [cv2.IMWRITE_JPEG_QUALITY, quality, cv2.IMWRITE_JPEG_OPTIMIZE, 0]
+    elif file_ext == '.webp':
+        params = [cv2.IMWRITE_WEBP_QUALITY, quality]
+    elif compression:
+        params = [cv2.IMWRITE_PNG_COMPRESSION, compression]
+    else:
+        params = []     # OpenCV's defaults are as fast as level 0 and give much smaller files
 
-    png_compression = [cv2.IMWRITE_PNG_COMPRESSION, compression]  # Set compression value
+    # Encode on this thread, then hand the disk write to a background thread so the processing loop isn't held up by
+    # slow storage
+    success, buf = cv2.imencode(file_ext, im2save, params)
+    if not success:
+        raise IOError(f"Failed to encode SO2 image {full_path}")
+    future = _so2_img_writer.submit(_write_atomic, full_path, lambda f: f.write(buf))
+    future.add_done_callback(functools.partial(_log_so2_img_write, full_path))
+    return future
+
+
+# Single background thread writing SO2 images, so they still reach disk in the order they were saved
+_so2_img_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='so2_img_writer')
 
-    # Save image
-    cv2.imwrite(full_path, im2save, png_compression)
+
+def _log_so2_img_write(full_path, future):
+    """Reports failed background SO2 image writes, which would otherwise go unnoticed"""
+    if future.exception() is not None:
+        pycamLogger.error(f'Failed to save SO2 image {full_path}: {future.exception()}')
+
+
+# Append handles for emission rate files, keyed by (line directory, flow mode). Kept open between calls since rows are
+# appended every processing cycle
+_emission_files = {}
+_emission_float_fmt = '%.3f'
+
+# Time of the last row appended to each emission rate file, keyed as _emission_files, as (pathname, time) so that
+# repeat calls without any new data don't append duplicate rows
+_emission_last_rows = {}
+
+# Column headings for saved emission rate files
+_emission_cols = {
+    "_phi": "flux_(kg/s)",
+    "_phi_err": "flux_err",
+    "_velo_eff": "velo_eff_(m/s)",
+    "_velo_eff_err": "velo_eff_err",
+    "_frac_optflow_ok": "frac_optflow_ok",
+    "_frac_optflow_ok_ica": "frac_optflow_ok_ica"
+}
+
+
+def _emission_file(line_path, flow_mode, pathname):
+    """Returns a line-buffered append handle for pathname, closing any previous (e.g. yesterday's) file for the key"""
+    key = (line_path, flow_mode)
+    f = _emission_files.get(key)
+    if f is None or f.closed or f.name != pathname:
+        if f is not None:
+            f.close()
+        f = _emission_files[key] = open(pathname, 'a', buffering=1, newline='')
+    return f
+
+
+@atexit.register
+def _close_emission_files():
+    for f in _emission_files.values():
+        f.close()
+    _emission_files.clear()
 
 
 def save_emission_rates_as_txt(path, emission_dict, ICA_dict, only_last_value=False):
@@ -411,14 +785,10 @@ def save_emission_rates_as_txt(path, emission_dict, ICA_dict, only_last_value=Fa
     file_fmt = "{}_EmissionRates_{}.txt"
     date_fmt = "%Y%m%d"
 
-    emis_cols = {
-        "_phi": "flux_(kg/s)",
-        "_phi_err": "flux_err",
-        "_velo_eff": "velo_eff_(m/s)",
-        "_velo_eff_err": "velo_eff_err",
-        "_frac_optflow_ok": "frac_optflow_ok",
-        "_frac_optflow_ok_ica": "frac_optflow_ok_ica"
-    }
+    # Release handles left open from a previous processing run saved elsewhere
+    for key in [key for key in _emission_files if os.path.normpath(os.path.dirname(key[0])) != os.path.normpath(path)]:
+        _emission_files.pop(key).close()
+        _emission_last_rows.pop(key, None)
 
     # Loop through lines (includes 'total' and save data to it
     for line_id in emission_dict:
@@ -432,12 +802,6 @@ def save_emission_rates_as_txt(path, emission_dict, ICA_dict, only_last_value=Fa
             pycamLogger.error('Could not save emission rate data as path definition is not valid.')
             pycamLogger.error(e)
         
-        index = -1 if only_last_value else 0
-
-        ICA_masses_df = DataFrame(ICA_dict[line_id]['value'][index:],
-                                  index = ICA_dict[line_id]['datetime'][index:],
-                                  columns = ["ICA_mass_(kg/m)"])
-
         for flow_mode in emission_dict[line_id]:
             emis_dict = emission_dict[line_id][flow_mode]
             # Check there is data in this dictionary - if not, we don't save this data
@@ -449,26 +813,69 @@ def save_emission_rates_as_txt(path, emission_dict, ICA_dict, only_last_value=Fa
             pathname = os.path.join(line_path, filename)
 
             if only_last_value:
-                emission_df = get_last_emission_vals(emis_dict)
-                header = False
+                # Nothing new since the last call
+                last_row = (pathname, emis_dict._start_acq[-1])
+                if _emission_last_rows.get((line_path, flow_mode)) == last_row:
+                    continue
+
+                # Appending a single row every cycle - format it directly rather than going through pandas.
+                # Reusing the open handle avoids reopening the file every time
+                _emission_file(line_path, flow_mode, pathname).write(
+                    _last_emission_row(emis_dict, ICA_dict[line_id]) + os.linesep)
+                _emission_last_rows[(line_path, flow_mode)] = last_row
+                continue
             elif os.path.exists(pathname):
                 continue
-            else:
-                # Convert emis_dict object to dataframe
-                emission_df = emis_dict.to_pandas_dataframe()
-                header = True
 
+            # Convert emis_dict object to dataframe
+            emission_df = emis_dict.to_pandas_dataframe()
+            ICA_masses_df = DataFrame(ICA_dict[line_id]['value'],
+                                      index=ICA_dict[line_id]['datetime'],
+                                      columns=["ICA_mass_(kg/m)"])
             emission_df = emission_df.join(ICA_masses_df)
 
-            # Round to 3 decimal places
-            emission_df = emission_df.round(3)
-
             # Adjust headings
             emission_df.index.name = "datetime"
-            emission_df = emission_df.rename(columns=emis_cols)
+            emission_df = emission_df.rename(columns=_emission_cols)
+
+            # Save as csv, with floats written to 3 decimal places by pandas' writer rather than rounding a copy first
+            emission_df.to_csv(pathname, mode='a', header=True, float_format=_emission_float_fmt)
+
+
+def _csv_time(time_obj):
+    """Formats datetime as pandas writes a single-row index to csv (fractional seconds trimmed to ms if possible)"""
+    time_str = time_obj.strftime('%Y-%m-%d %H:%M:%S')
+    if time_obj.microsecond % 1000:
+        time_str += '.{:06d}'.format(time_obj.microsecond)
+    elif time_obj.microsecond:
+        time_str += '.{:03d}'.format(time_obj.microsecond // 1000)
+    return time_str
 
-            # Save as csv
-            emission_df.to_csv(pathname, mode='a', header=header)
+
+def _csv_val(val):
+    """Formats value as written by pandas (with _emission_float_fmt) in save_emission_rates_as_txt"""
+    if val is None or (isinstance(val, float) and np.isnan(val)):
+        return ''
+    if isinstance(val, (int, np.integer)):
+        return str(int(val))
+    return _emission_float_fmt % val
+
+
+def _last_emission_row(emission_obj, ICA_masses):
+    """
+    Builds the most recent emission rate csv row - the same row as get_last_emission_vals joined with the ICA mass
+    measured at the same time (left empty if there isn't one), rounded and written by pandas
+    :param emission_obj:    EmissionRates   Emission rates for one line and flow mode
+    :param ICA_masses:      dict            ICA masses for the line, with 'datetime' and 'value' lists
+    """
+    time_obj = emission_obj._start_acq[-1]
+    vals = [value[-1] if len(value) > 0 else np.nan
+            for key, value in emission_obj.to_dict().items() if key != '_start_acq']
+    if len(ICA_masses['datetime']) > 0 and ICA_masses['datetime'][-1] == time_obj:
+        vals.append(ICA_masses['value'][-1])
+    else:
+        vals.append(np.nan)
+    return ','.join([_csv_time(time_obj)] + [_csv_val(val) for val in vals])
 
 
 def get_last_emission_vals(emission_obj):
@@ -494,6 +901,9 @@ def write_script_crontab(filename, cmd, time_on):
         pycamLogger.warning('Lengths of lists of crontab commands and times must be equal')
         return
 
+    # Ensure read_script_crontab() doesn't return stale data if the file is rewritten within the mtime resolution
+    _read_script_crontab_cached.cache_clear()
+
     with open(filename, 'w', newline='\n') as f:
         f.write('# Crontab schedule file written by pycam\n')
 
@@ -518,29 +928,48 @@ def write_script_crontab(filename, cmd, time_on):
 
 def read_script_crontab(filename, cmds):
     """Reads file containing start/stop pycam script times"""
-    times = {}
+    # Parsed files are cached, keyed by modification time and size so that any change on disk forces a re-read
+    stat = os.stat(filename)
+    return dict(_read_script_crontab_cached(filename, stat.st_mtime_ns, stat.st_size, tuple(cmds)))
 
+
+@functools.lru_cache(maxsize=8)
+def _crontab_cmd_pattern(cmds):
+    """
+    Compiled pattern matching every crontab line that runs one of cmds, so the whole file is parsed in one sweep.
+    Captures the comment marker (if the line is commented out), the minute and hour fields and the command.
+    Longer commands are tried first so that a command which is a prefix of another can't shadow it
+    """
+    cmd_alternation = '|'.join(re.escape(cmd) for cmd in sorted(cmds, key=len, reverse=True))
+    return re.compile(r'^[ \t]*(?P<comment>#)?[ \t]*(?P<minute>\S+)[ \t]+(?P<hour>\S+).*?(?P<cmd>{})'.format(
+        cmd_alternation), re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=32)
+def _read_script_crontab_cached(filename, mtime, size, cmds):
+    """Cached worker for read_script_crontab(). mtime and size are only used as part of the cache key"""
+    times = {}
     with open(filename, 'r') as f:
-        for line in f:
-            # Loop through commands to check if any are in the current file line
-            for cmd in cmds:
-                if cmd in line:
-                    minute, hour = line.split()[0:2]
-                    # If hour is * then we are running defined by minutes only
-                    if hour == '*':
-                        hour = 0
-                        # We then need to catch this case, where 0 means hourly, so we set minute to 60
-                        if minute == '0':
-                            minute = 60
-                        else:
-                            # We now need to catch other cases where running defined by minutes only '*/{}' fmt
-                            minute = minute.split('/')[-1]
-                    # If the line is commented out, we set everything to 0 (e.g. used for temperature logging)
-                    if line[0] == '#':
-                        minute = 0
-                        hour = 0
-
-                    times[cmd] = (int(hour), int(minute))
+        contents = f.read()
+
+    for match in _crontab_cmd_pattern(cmds).finditer(contents):
+        # If the line is commented out, we set everything to 0 (e.g. used for temperature logging)
+        if match['comment']:
+            times[match['cmd']] = (0, 0)
+            continue
+
+        minute, hour = match['minute'], match['hour']
+        # If hour is * then we are running defined by minutes only
+        if hour == '*':
+            hour = 0
+            # We then need to catch this case, where 0 means hourly, so we set minute to 60
+            if minute == '0':
+                minute = 60
+            else:
+                # We now need to catch other cases where running defined by minutes only '*/{}' fmt
+                minute = minute.split('/')[-1]
+
+        times[match['cmd']] = (int(hour), int(minute))
     return times
 
 
@@ -550,20 +979,11 @@ def read_temp_log(filename):
     :param filename:
     :return:
     """
-    date_fmt = '%Y-%m-%d %H:%M:%S'
-    dates = []
-    temps = []
-    with open(filename, 'r', newline='\n') as f:
-        for line in f:
-            sep = [k.strip() for k in line.split(',')]
-            date_obj = datetime.datetime.strptime(sep[0], date_fmt)
-            cpu_temp = float(sep[2])
-            ssd_temp = float(sep[4])
-            adc_temp = float(sep[6])
-            dates.append(date_obj)
-            temps.append([cpu_temp, ssd_temp, adc_temp])
-
-    dates = np.array(dates)
-    temps = np.array(temps)
+    # Lines are "date time, CPU, temp, SSD, temp, ADC, temp" - parse all columns at once rather than line by line
+    log = read_csv(filename, header=None, usecols=[0, 2, 4, 6], names=['datetime', 'cpu', 'ssd', 'adc'],
+                   skipinitialspace=True, engine='c', dtype={'cpu': float, 'ssd': float, 'adc': float},
+                   parse_dates=['datetime'], date_format='%Y-%m-%d %H:%M:%S')
+    dates = np.asarray(log['datetime'].dt.to_pydatetime())
+    temps = log[['cpu', 'ssd', 'adc']].to_numpy(dtype=float)
 
     return dates, temps
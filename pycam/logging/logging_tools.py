@@ -1,7 +1,181 @@
+import collections
+import functools
 import logging
+import sys
+import threading
+import time
+import weakref
 import colorlog
 from pathlib import Path
-from logging.handlers import TimedRotatingFileHandler, MemoryHandler
+from logging.handlers import BaseRotatingHandler, TimedRotatingFileHandler, MemoryHandler
+
+class _BufferedFlushMixin:
+    """ Mixin for file handlers to buffer records rather than flushing the file after every record.
+    Buffered records are written once the buffer fills, as soon as an ERROR (or above) record is logged, when the
+    handler is explicitly flushed (including every LoggerManager.flush_interval seconds) and when it is closed
+    (logging flushes and closes all handlers at exit).
+    """
+
+    buffer_size = 65536
+    _defer_flush = False
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size, encoding=self.encoding,
+                    errors=self.errors)
+
+    def emit(self, record):
+        # StreamHandler.emit() flushes after writing each record, so skip that unless the record is an error
+        self._defer_flush = record.levelno < logging.ERROR
+        try:
+            super().emit(record)
+        finally:
+            self._defer_flush = False
+
+    def flush(self):
+        # Checked under the handler lock (held by emit) so a flush from another thread isn't skipped mid-emit
+        with self.lock:
+            if not self._defer_flush:
+                super().flush()
+
+
+class _DedupMixin:
+    """ Mixin for handlers to drop repeats of a record (same logger, level and message) logged within dedup_interval
+    seconds of the last one written, so a message repeated in a long running loop doesn't flood the logs. The next copy
+    written notes how many were dropped. Only the most recent dedup_maxsize distinct messages are tracked.
+    """
+
+    dedup_interval = 60     # Time window to drop repeated records in (s)
+    dedup_maxsize = 1024    # Number of distinct messages to track
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._seen = collections.OrderedDict()  # (name, level, message): [time written, number dropped]
+
+    def dedup(self, record):
+        """ Check a record against those already written. Must be called with the handler lock held (as emit is).
+
+        :param logging.LogRecord record: Record to be written
+        :return (logging.LogRecord|None): None if the record is a repeat to drop, otherwise the record to write - a copy
+        noting how many repeats were dropped if there were any
+        """
+        message = record.getMessage()
+        key = (record.name, record.levelno, message)
+        entry = self._seen.get(key)
+        if entry is not None and record.created - entry[0] < self.dedup_interval:
+            entry[1] += 1
+            return None
+
+        self._seen[key] = [record.created, 0]
+        self._seen.move_to_end(key)
+        if len(self._seen) > self.dedup_maxsize:
+            self._seen.popitem(last=False)
+
+        if entry is not None and entry[1]:
+            # Copy the record, as it is shared with the logger's other handlers
+            record = logging.makeLogRecord(record.__dict__)
+            record.msg = f"{message} (repeated {entry[1]} times)"
+            record.args = None
+        return record
+
+    def emit(self, record):
+        record = self.dedup(record)
+        if record is not None:
+            super().emit(record)
+
+
+class BufferedFileHandler(_DedupMixin, _BufferedFlushMixin, logging.FileHandler):
+    """ FileHandler which buffers records and drops repeated records, see _BufferedFlushMixin and _DedupMixin """
+
+
+class BufferedTimedRotatingFileHandler(_DedupMixin, _BufferedFlushMixin, TimedRotatingFileHandler):
+    """ TimedRotatingFileHandler which buffers records and drops repeated records, see _BufferedFlushMixin and
+    _DedupMixin """
+
+
+class DedupStreamHandler(_DedupMixin, logging.StreamHandler):
+    """ StreamHandler which drops repeated records, see _DedupMixin """
+
+
+@functools.lru_cache(maxsize=256)
+def _log_path_key(log_path):
+    """ Key used for a log file in LoggerManager._file_handlers, cached as the same few paths are added and removed
+    repeatedly """
+    return Path(log_path).as_posix()
+
+
+class _FastFormatter(logging.Formatter):
+    """ Formatter which reuses the formatted timestamp for records logged within the same second, rather than calling
+    time.localtime and time.strftime for every record. Only valid for date formats without sub-second fields.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last_time = (None, None, '')  # (second, datefmt, formatted string), replaced as one for thread safety
+
+    def formatTime(self, record, datefmt=None):
+        sec = int(record.created)
+        last_sec, last_datefmt, last_str = self._last_time
+        if sec == last_sec and datefmt == last_datefmt:
+            return last_str
+        time_str = time.strftime(datefmt or self.default_time_format, self.converter(sec))
+        self._last_time = (sec, datefmt, time_str)
+        return time_str
+
+
+class _LazyMemoryHandler(MemoryHandler):
+    """ MemoryHandler holding records in a ring buffer until it has a target. Without a target the buffer can't be
+    flushed, so rather than growing without limit only the most recent capacity records are kept. Flushing (and taking
+    the handler lock) is also skipped until then, as MemoryHandler would otherwise try on every record once over
+    capacity. With a target set it flushes as soon as capacity is reached, so no records are dropped
+    """
+
+    def __init__(self, capacity, *args, **kwargs):
+        super().__init__(capacity, *args, **kwargs)
+        self.buffer = collections.deque(maxlen=capacity)
+
+    def flush(self):
+        if self.target is None:
+            return
+        # Rotating handlers check for rollover per record, so leave those (and non-file targets) to MemoryHandler
+        if not isinstance(self.target, logging.FileHandler) or isinstance(self.target, BaseRotatingHandler):
+            super().flush()
+            return
+        with self.lock:
+            if self.buffer:
+                self._flush_batch()
+
+    def _flush_batch(self):
+        """ Write all buffered records to the target file in one write, taking the target's lock once rather than
+        once per record. Records still go through the target's filters, and its repeat dropping (see _DedupMixin) """
+        target = self.target
+        dedup = target.dedup if isinstance(target, _DedupMixin) else None
+        lines = []
+        with target.lock:
+            for record in self.buffer:
+                result = target.filter(record)
+                if not result:
+                    continue
+                if isinstance(result, logging.LogRecord):  # Python 3.12+ filters can replace the record
+                    record = result
+                if dedup is not None:
+                    record = dedup(record)
+                    if record is None:
+                        continue
+                try:
+                    lines.append(target.format(record) + target.terminator)
+                except Exception:
+                    target.handleError(record)
+            self.buffer.clear()
+            if not lines:
+                return
+            try:
+                if target.stream is None:   # Opened on first use if the handler was created with delay=True
+                    target.stream = target._open()
+                target.stream.write(''.join(lines))
+                target.flush()
+            except Exception:
+                target.handleError(record)
+
 
 class LoggerManager:
     """ Class for managing creation of loggers and creation and deletion of handlers 
@@ -11,7 +185,11 @@ class LoggerManager:
     _loggers = {}  # Store created loggers to prevent duplicates
     _file_handlers = {}  # Store file handlers to avoid duplicates
     _mem_handlers = {}
-    _file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s', '%Y-%m-%d %H:%M:%S')
+    _buffered_handlers = weakref.WeakSet()  # All buffered file handlers, flushed periodically by _flush_thread
+    _flush_thread = None
+    flush_interval = 30     # Seconds between flushes of buffered file handlers
+    _stream_formatters = {}  # Console formatters, keyed by colour (None for plain output)
+    _file_formatter = _FastFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s', '%Y-%m-%d %H:%M:%S')
 
     @staticmethod
     def add_logger(name, colour = "white", level = logging.INFO):
@@ -42,14 +220,14 @@ class LoggerManager:
         :param (str|Path) log_path: Location to write the log file to
         :param int level: Logging level to set for the FileHandler, defaults to logging.DEBUG
         """
-        log_path = Path(log_path)
-        try:
-            log_path.parent.mkdir(parents=True, exist_ok=True)
-        except Exception as e:
-            print(f"Error creating log file: {e}")
-
-        file_handler_key = log_path.as_posix()  # Use log file path as key
+        file_handler_key = _log_path_key(log_path)  # Use log file path as key
         if file_handler_key not in LoggerManager._file_handlers:
+            log_path = Path(log_path)
+            try:
+                log_path.parent.mkdir(parents=True, exist_ok=True)
+            except Exception as e:
+                print(f"Error creating log file: {e}")
+
             root_logger = logger.name == "root"
             file_handler = LoggerManager.create_file_handler(log_path, root_logger=root_logger, level=level)
             LoggerManager._file_handlers[file_handler_key] = file_handler
@@ -60,7 +238,8 @@ class LoggerManager:
     def create_file_handler(log_path, root_logger = False, level=logging.DEBUG):
         """ Create a new file handler.
         The type of file handler will depend on the root_logger parameter. If it is True a 
-        TimedRotatingFileHandler will be created, otherwise a FileHandler will be created.
+        TimedRotatingFileHandler will be created, otherwise a FileHandler will be created. Both buffer records
+        rather than flushing the file for each one, see _BufferedFlushMixin, and drop repeated records, see _DedupMixin.
 
         :param (str|Path) log_path: Path specifying location of the log file
         :param bool root_logger: Is this for the root logger? defaults to False
@@ -69,14 +248,60 @@ class LoggerManager:
         created file handler
         """
         if root_logger:
-            file_handler = TimedRotatingFileHandler(log_path, when = 'D', interval=1, backupCount=5)
+            file_handler = BufferedTimedRotatingFileHandler(log_path, when = 'D', interval=1, backupCount=5)
         else:
-            file_handler = logging.FileHandler(log_path)
+            file_handler = BufferedFileHandler(log_path)
         file_handler.setFormatter(LoggerManager._file_formatter)
         file_handler.setLevel(level)
 
+        LoggerManager._buffered_handlers.add(file_handler)
+        LoggerManager._start_flush_thread()
+
         return file_handler
 
+    @staticmethod
+    def configure_root(root_log_path=None, level=logging.INFO):
+        """ Add a file handler to the root logger, so that records from every logger are saved to one session log.
+        Called by application entry points (GUI and scripts) rather than on import, so importing pycam doesn't touch
+        the filesystem. Does nothing if the root log file has already been set up.
+
+        :param (str|Path) root_log_path: Location of the root log file, defaults to ~/pycam/logs/root.log
+        :param int level: Logging level for the root logger and its file handler, defaults to logging.INFO
+        """
+        if root_log_path is None:
+            root_log_path = Path.home() / "pycam" / "logs" / "root.log"
+
+        # File handlers are tracked by path, so there's no need to scan the root logger's handlers
+        if _log_path_key(root_log_path) in LoggerManager._file_handlers:
+            return
+
+        root_logger = logging.getLogger()
+        LoggerManager.add_file_handler(root_logger, root_log_path, level=level)
+        root_logger.setLevel(level)
+
+        # Log message on creation
+        root_logger.info("New session started")
+
+    @staticmethod
+    def flush_file_handlers():
+        """ Write all buffered file handler records to disk """
+        for handler in list(LoggerManager._buffered_handlers):
+            handler.flush()
+
+    @staticmethod
+    def _start_flush_thread():
+        """ Start the background thread which periodically flushes buffered file handlers, if not already running """
+        if LoggerManager._flush_thread is None:
+            LoggerManager._flush_thread = threading.Thread(target=LoggerManager._flush_loop, name="LogFlush",
+                                                           daemon=True)
+            LoggerManager._flush_thread.start()
+
+    @staticmethod
+    def _flush_loop():
+        while True:
+            time.sleep(LoggerManager.flush_interval)
+            LoggerManager.flush_file_handlers()
+
     @staticmethod
     def remove_file_handler(logger, log_path, delete=False):
         """ Remove Filehandler from an existing logger. Removed based on the path to the log file.
@@ -86,7 +311,7 @@ class LoggerManager:
         :param bool delete: Close and delete the file handler after removal, Defaults to False
         """
 
-        log_path = Path(log_path).as_posix()
+        log_path = _log_path_key(log_path)
         if log_path in LoggerManager._file_handlers:
             logger.removeHandler(LoggerManager._file_handlers[log_path])
 
@@ -95,7 +320,7 @@ class LoggerManager:
                 del LoggerManager._file_handlers[log_path]
     
     @staticmethod
-    def add_mem_handler(logger, log_key, level=logging.DEBUG):
+    def add_mem_handler(logger, log_key, level=logging.DEBUG, capacity=10_000):
         """ Add a memory handler to an existing logger.
         Will create a new hander if one with the same log_key doesn't already exist, otherwise will 
         use the existing handler.
@@ -103,9 +328,11 @@ class LoggerManager:
         :param logging.Logger logger: The logger to add the memory handler to
         :param str log_key: Key identifying the memory handler
         :param int level: Logging level for the memory handler, defaults to logging.DEBUG
+        :param int capacity: Number of records buffered before flushing to the target, defaults to 10000. Until a
+        target is set only the most recent capacity records are kept
         """
         if log_key not in LoggerManager._mem_handlers:
-            mem_handler = MemoryHandler(capacity=1e4)
+            mem_handler = _LazyMemoryHandler(capacity=capacity, flushLevel=logging.ERROR, flushOnClose=True)
             mem_handler.setFormatter(LoggerManager._file_formatter)
             mem_handler.setLevel(level)
 
@@ -147,9 +374,11 @@ class LoggerManager:
 
         :param logger logger: logger object to remove stream handlers from
         """
-        for handler in logger.handlers:
-            if isinstance(handler, logging.StreamHandler):
-                logger.removeHandler(handler)
+        # Rebuild the list in one pass - removing while iterating over logger.handlers skips the handler after each
+        # removed one. FileHandlers are StreamHandler subclasses, so are explicitly kept
+        logger.handlers = [handler for handler in logger.handlers
+                           if not isinstance(handler, logging.StreamHandler)
+                           or isinstance(handler, logging.FileHandler)]
 
     @staticmethod
     def replace_stream_handlers(logger, colour = "white", level = logging.ERROR):
@@ -168,26 +397,21 @@ class LoggerManager:
 
     @staticmethod
     def create_stream_handler(colour, level):
-        format_str = f'%(log_color)s%(levelname)-8s%(reset)s%(asctime)s - %({colour})s%(name)s - %(message)s'
-        formatter = colorlog.ColoredFormatter(format_str, '%Y-%m-%d %H:%M:%S')
-        handler = colorlog.StreamHandler() # Output to console
+        # Only colour the output on a terminal, so escape codes aren't written when it is redirected to a file or pipe
+        if sys.stderr is None or not sys.stderr.isatty():
+            colour = None
+        # Formatters only differ by colour, so one is shared by all handlers of the same colour
+        formatter = LoggerManager._stream_formatters.get(colour)
+        if formatter is None:
+            if colour is None:
+                format_str = '%(levelname)-8s%(asctime)s - %(name)s - %(message)s'
+                formatter = logging.Formatter(format_str, '%Y-%m-%d %H:%M:%S')
+            else:
+                format_str = f'%(log_color)s%(levelname)-8s%(reset)s%(asctime)s - %({colour})s%(name)s - %(message)s'
+                formatter = colorlog.ColoredFormatter(format_str, '%Y-%m-%d %H:%M:%S')
+            LoggerManager._stream_formatters[colour] = formatter
+        handler = DedupStreamHandler() # Output to console (stderr)
         handler.setFormatter(formatter)
         handler.setLevel(level)  # Set the desired logging level
 
         return handler
-
-# Get the root logger
-root_logger = logging.getLogger()
-
-# If the root logger doesn't have a file handler then add one
-if not any(isinstance(handler, logging.FileHandler) for handler in root_logger.handlers):
-    # Start by defining the root log path
-    root_log_path = Path.home() / "pycam" / "logs" / "root.log"
-
-    # Add the file handler
-    LoggerManager.add_file_handler(root_logger, root_log_path, level = logging.INFO)
-    
-    root_logger.setLevel(logging.INFO)
-    
-    # Log message on creation
-    root_logger.info("New session started")
@@ -484,15 +484,17 @@ class FTPClient:
             except ftplib.error_perm as e:
                 networkLogging.error(e)
 
-    def get_data(self, data_name, rm=True):
+    def get_data(self, data_name, rm=True, check_connection=True):
         """Downloads image/spectrum
-        :param data_name:   str     Filename of image/spectrum on remote machine
-        :param rm:          bool    If True, the file is deleted from the host once it has been transferred
-                                    If False, transfer will keep running indefinitely as the transfer does not directly
-                                    identify files it has already transferred previously
+        :param data_name:           str     Filename of image/spectrum on remote machine
+        :param rm:                  bool    If True, the file is deleted from the host once it has been transferred
+                                            If False, transfer will keep running indefinitely as the transfer does not
+                                            directly identify files it has already transferred previously
+        :param check_connection:    bool    If True, the FTP connection is tested before transfer. Set to False when
+                                            the connection has just been tested (e.g. from get_data_batch)
         """
         # Test FTP connection
-        if not self.test_connection():
+        if check_connection and not self.test_connection():
             networkLogging.warning('Cannot establish FTP connection. File cannot be transferred')
             return
 
@@ -519,15 +521,9 @@ class FTPClient:
         if os.path.exists(local_name):
             networkLogging.warning(f'File already exists on local machine, transfer aborted: {file}')
         else:
-            # Create lockfile
-            lock_file = local_name.replace(ext, '.lock')
-            with open(lock_file, 'a') as f:
-                # flush & sync the file to ensure it's on disk
-                f.flush()
-                os.fsync(f.fileno())
-
-            # Download file
-            with open(local_name, 'wb') as f:
+            # Download under a temporary name and rename once complete, so the file only appears once it is whole
+            tmp_name = local_name + '.part'
+            with open(tmp_name, 'wb') as f:
                 start_time = time.time()
                 self.connection.retrbinary('RETR ' + data_name, f.write)
                 elapsed_time = time.time() - start_time
@@ -535,18 +531,10 @@ class FTPClient:
                 # flush & sync the file to ensure it's on disk
                 f.flush()
                 os.fsync(f.fileno())
+            os.replace(tmp_name, local_name)
             networkLogging.info(f'Transferred file {filename} from instrument to {local_date_dir}. '
                                 f'Transfer time: {elapsed_time:.4f}s')
 
-            while os.path.exists(lock_file):
-                try:
-                    os.remove(lock_file)
-                except PermissionError:
-                    networkLogging.warning('Got permission error trying to delete lock file')
-                    time.sleep(0.02)
-                except FileNotFoundError:
-                    break   # If the file doesn't exist then just ignore trying to delete it
-
         # Delete file after it has been transferred
         if rm:
             try:
@@ -557,6 +545,21 @@ class FTPClient:
 
         return local_name, local_date_dir
 
+    def get_data_batch(self, data_names, rm=True):
+        """Downloads a list of images/spectra, testing the FTP connection once for the whole batch
+        :param data_names:  list    Filenames of images/spectra on remote machine
+        :param rm:          bool    If True, the files are deleted from the host once they have been transferred
+        """
+        if not data_names:
+            return []
+
+        # Test FTP connection
+        if not self.test_connection():
+            networkLogging.warning('Cannot establish FTP connection. Files cannot be transferred')
+            return []
+
+        return [self.get_data(data_name, rm=rm, check_connection=False) for data_name in data_names]
+
     def watch_dir(self, lock='.lock', new_only=False, reconnect=True):
         """Public access thread starter for _watch_dir"""
         networkLogging.info('FTP: Start watching directory')
@@ -665,7 +668,9 @@ class FTPClient:
                 # Extract filename to generate lock file
                 filename, ext = os.path.splitext(file)
                 lock_file = filename + lock
-                if lock_file in file_list:      # Don't download image if it is still locked
+                if ext == '.part':              # File is still being written
+                    continue
+                elif lock_file in file_list:    # Don't download image if it is still locked
                     continue
                 else:
                     networkLogging.info('Getting file: {}'.format(file))
@@ -755,7 +760,9 @@ class FTPClient:
                 # Extract filename to generate lock file
                 filename, ext = os.path.splitext(file)
                 lock_file = filename + lock
-                if lock_file in file_list:      # Don't download image if it is still locked
+                if ext == '.part':              # File is still being written
+                    continue
+                elif lock_file in file_list:    # Don't download image if it is still locked
                     continue
                 else:
                     networkLogging.info(f'Getting file: {file}')
@@ -9,6 +9,7 @@ from pycam.utils import check_filename, read_file, append_to_log_file
 from pycam.networking.commands import AcquisitionComms
 from pycam.logging.logging_tools import LoggerManager
 
+import re
 import socket
 import struct
 import time
@@ -54,16 +55,56 @@ def read_network_file(filename: str) -> tuple[str | None, int | None]:
     return ip_addr, port
 
 
+def wait_readable(connection, timeout: float) -> bool:
+    """Waits until data can be read from a connection
+
+    Uses poll() where available (not on Windows), which watches just this connection rather than building and
+    scanning fd sets like select() and has no limit on the file descriptor number (select() fails above 1023)
+
+    Parameters
+    ----------
+    connection
+        Object which has fileno() function, e.g. a socket
+    timeout: float
+        Maximum time to wait (s)
+
+    :returns
+    bool
+        True if the connection is ready to read from"""
+    if hasattr(select, 'poll'):
+        poller = select.poll()
+        poller.register(connection, select.POLLIN)
+        return bool(poller.poll(timeout * 1000))
+    return bool(select.select([connection], [], [], timeout)[0])
+
+
+def _cmd_table(cmd_dict: dict) -> dict:
+    """Builds the validation table used by SocketMeths.decode_comms from CommsFuncs.cmd_dict: key as key, value as tuple
+    (type, accepted values or minimum, maximum). Accepted values is None if any str is accepted"""
+    cmd_tbl = {}
+    for key, (cmd_type, cmd_range) in cmd_dict.items():
+        if cmd_type is bool:
+            cmd_tbl[key] = (bool, None, None)
+        elif cmd_type is str:
+            cmd_tbl[key] = (str, frozenset(cmd_range) or None, None)
+        else:
+            cmd_tbl[key] = (cmd_type, cmd_range[0], cmd_range[-1])
+    return cmd_tbl
+
+
 class SendRecvSpecs:
     """Simple class containing some message separators for sending and receiving messages via sockets"""
     encoding = 'utf-8'
     ret_char = '\r\n'
     end_str = bytes("END" + ret_char, encoding)
     len_end_str = len(end_str)
+    recv_size = 65536   # Maximum bytes taken from the socket per recv() call in recv_comms
 
     header_char = 'H_DATASIZE='     # Header start for comms
     header_num_size = 8             # Size of number in digits for header
     header_size = len(header_char) + len(ret_char) + header_num_size
+    header_start = bytes(header_char, encoding)     # Encoded header start and end, used by generate_header
+    header_end = bytes(ret_char, encoding)
 
     filename_start = b'FILENAME='
     filename_end = b'FILE_END'
@@ -86,68 +127,76 @@ class CommsFuncs(SendRecvSpecs):
     #     | tuple[type[bool], int],
     # ]
 
-    def __init__(self):
-        # Create dictionary for communication protocol. Dictionary contains:
-        # character code as key, value as tuple (type, range of accepted values)
-        # All values are converted to ASCII before being sent over the network
-        self.cmd_dict = {
-            'IDN': (str, ['CM1', 'CM2', 'SPE', 'EXN', 'MAS', 'NUL']),  # Identity of message sender (EXT not used for external to avoid confusion with EXT exit command)
-            'DST': (str, ['CM1', 'CM2', 'SPE', 'EXN', 'MAS']),  # Identity of message destination, if not set send to all
-            'SSA': (int, [1, 6000001]),            # Shutter speed (us) camera A [min, max]
-            'SSB': (int, [1, 6000001]),            # Shutter speed (us) camera B [min, max]
-            'SSS': (int, [1, 10001]),            # Shutter speed (ms) spectrometer [min, max]
-            'FRC': (float, [0.0, 1.0]),         # Framerate camera [min, max]
-            'FRS': (float, [0.0, 10.0]),        # Framerate spectrometer [min, max]
-            'ATA': (bool, [0, 1]),              # Auto-shutter speed for camera A [options]
-            'ATB': (bool, [0, 1]),              # Auto-shutter speed for camera B [options]
-            'ATS': (bool, [0, 1]),              # Auto-shutter speed for spectrometer [options]
-            'CAD': (int, [0, 20]),              # Coadd number
-            'SMN': (float, [0.0, 0.9]),         # Minimum saturation accepted before adjusting shutter speed
-            'SMX': (float, [0.1, 1.0]),         # Maximum saturation accepted before adjusting shutter speed
-            'PXC': (int, [0, 10000]),           # Number of saturation pixels average
-            'RWC': (int, [-CameraSpecs().pix_num_y, CameraSpecs().pix_num_y]),  # Number of rows
-            'PXS': (int, [0, SpecSpecs().pix_num]),     # Number of pixels to average for determining saturation
-            'WMN': (int, [300, 400]),           # Minimum wavelength of spectra to check saturation
-            'WMX': (int, [300, 400]),           # Maximum wavelength of spectra to check saturation
-            'SNS': (float, [0.0, 0.9]),         # Minimum saturation accepted for spectra before adjusting int. time
-            'SXS': (float, [0.1, 1.0]),         # Maximum saturation accepted for spectra before adjusting int. time
-            'TPA': (str, []),           # Type of image (empty list shows it will accept any form) - for on band acq
-            'TPB': (str, []),           # Type of image (empty list shows it will accept any form) - for off band acq
-            'TPS': (str, []),           # Type of spectrum
-            'DKC': (bool, 1),           # Starts capture of dark sequence in camera (stops continuous capt if necessary)
-            'DFC': (bool, 1),           # Flags that dark capture sequence has finished on the camera
-            'DKS': (bool, 1),           # Starts capture of dark sequence in spectrometer
-            'DFS': (bool, 1),           # Flags that dark capture sequence has finished on the spectrometer
-            'SPC': (bool, 1),           # Stops continuous image acquisitions
-            'SPS': (bool, 1),           # Stops continuous spectra acquisitions
-            'STC': (bool, 1),           # Starts continuous image acquisitions
-            'STS': (bool, 1),           # Starts continuous spectra acquisitions
-            'EXT': (bool, 1),           # Close program (should only be succeeded by 1, to confirm close request)
-            'DXT': (bool, 1),           # Force exit mid dark capture
-            'RST': (bool, 1),           # Restart entire system
-            'LOG': (int, [0, 5]),       # Various status report requests:
-                                        # 0 - Test connection (can send just to confirm we have connection to instument)
-                                        # 1 - Current settings of camera and spectrometer
-                                        # 2 - Battery log
-                                        # 3 - Temperature log
-                                        # 4 - Full log
-            'HLO': (bool, 1),           # Just a friendly hello, when True get a hello back
-            'HLA': (bool, 1),           # Hello from Camera A
-            'HLB': (bool, 1),           # Hello from Camera B
-            'HLS': (bool, 1),           # Hello from Spectrometer
-            'HLM': (bool, 1),           # Hello from Master
-            'GBY': (int, [0, 65535]),   # Just a friendly goodbye, optionally specify remote port for clean disconnection
-            'SAV': (bool, 1),           # Trigger a save of specifications files
-            'NIA': (str, []),           # New image from Camera A (on band)
-            'NIB': (str, []),           # New image from Camera B (off band)
-            'NMA': (str, []),           # New image metadata from Camera A (on band)
-            'NMB': (str, []),           # New image metadata from Camera B (off band)
-            'NIS': (str, []),           # New image from the Spectrometer
-            'CLI': (bool, 1),           # Return list of connected clients
-            'MSG': (str, []),           # Generic string message
-            }
-        # Error flag, which provides the key in which an error was found
-        self.cmd_dict['ERR'] = (str, list(self.cmd_dict.keys()))
+    # Dictionary for communication protocol, built once when the module is imported. Dictionary contains:
+    # character code as key, value as tuple (type, range of accepted values)
+    # All values are converted to ASCII before being sent over the network
+    cmd_dict = {
+        'IDN': (str, ['CM1', 'CM2', 'SPE', 'EXN', 'MAS', 'NUL']),  # Identity of message sender (EXT not used for external to avoid confusion with EXT exit command)
+        'DST': (str, ['CM1', 'CM2', 'SPE', 'EXN', 'MAS']),  # Identity of message destination, if not set send to all
+        'SSA': (int, [1, 6000001]),            # Shutter speed (us) camera A [min, max]
+        'SSB': (int, [1, 6000001]),            # Shutter speed (us) camera B [min, max]
+        'SSS': (int, [1, 10001]),            # Shutter speed (ms) spectrometer [min, max]
+        'FRC': (float, [0.0, 1.0]),         # Framerate camera [min, max]
+        'FRS': (float, [0.0, 10.0]),        # Framerate spectrometer [min, max]
+        'ATA': (bool, [0, 1]),              # Auto-shutter speed for camera A [options]
+        'ATB': (bool, [0, 1]),              # Auto-shutter speed for camera B [options]
+        'ATS': (bool, [0, 1]),              # Auto-shutter speed for spectrometer [options]
+        'CAD': (int, [0, 20]),              # Coadd number
+        'SMN': (float, [0.0, 0.9]),         # Minimum saturation accepted before adjusting shutter speed
+        'SMX': (float, [0.1, 1.0]),         # Maximum saturation accepted before adjusting shutter speed
+        'PXC': (int, [0, 10000]),           # Number of saturation pixels average
+        'RWC': (int, [-CameraSpecs().pix_num_y, CameraSpecs().pix_num_y]),  # Number of rows
+        'PXS': (int, [0, SpecSpecs().pix_num]),     # Number of pixels to average for determining saturation
+        'WMN': (int, [300, 400]),           # Minimum wavelength of spectra to check saturation
+        'WMX': (int, [300, 400]),           # Maximum wavelength of spectra to check saturation
+        'SNS': (float, [0.0, 0.9]),         # Minimum saturation accepted for spectra before adjusting int. time
+        'SXS': (float, [0.1, 1.0]),         # Maximum saturation accepted for spectra before adjusting int. time
+        'TPA': (str, []),           # Type of image (empty list shows it will accept any form) - for on band acq
+        'TPB': (str, []),           # Type of image (empty list shows it will accept any form) - for off band acq
+        'TPS': (str, []),           # Type of spectrum
+        'DKC': (bool, 1),           # Starts capture of dark sequence in camera (stops continuous capt if necessary)
+        'DFC': (bool, 1),           # Flags that dark capture sequence has finished on the camera
+        'DKS': (bool, 1),           # Starts capture of dark sequence in spectrometer
+        'DFS': (bool, 1),           # Flags that dark capture sequence has finished on the spectrometer
+        'SPC': (bool, 1),           # Stops continuous image acquisitions
+        'SPS': (bool, 1),           # Stops continuous spectra acquisitions
+        'STC': (bool, 1),           # Starts continuous image acquisitions
+        'STS': (bool, 1),           # Starts continuous spectra acquisitions
+        'EXT': (bool, 1),           # Close program (should only be succeeded by 1, to confirm close request)
+        'DXT': (bool, 1),           # Force exit mid dark capture
+        'RST': (bool, 1),           # Restart entire system
+        'LOG': (int, [0, 5]),       # Various status report requests:
+                                    # 0 - Test connection (can send just to confirm we have connection to instument)
+                                    # 1 - Current settings of camera and spectrometer
+                                    # 2 - Battery log
+                                    # 3 - Temperature log
+                                    # 4 - Full log
+        'HLO': (bool, 1),           # Just a friendly hello, when True get a hello back
+        'HLA': (bool, 1),           # Hello from Camera A
+        'HLB': (bool, 1),           # Hello from Camera B
+        'HLS': (bool, 1),           # Hello from Spectrometer
+        'HLM': (bool, 1),           # Hello from Master
+        'GBY': (int, [0, 65535]),   # Just a friendly goodbye, optionally specify remote port for clean disconnection
+        'SAV': (bool, 1),           # Trigger a save of specifications files
+        'NIA': (str, []),           # New image from Camera A (on band)
+        'NIB': (str, []),           # New image from Camera B (off band)
+        'NMA': (str, []),           # New image metadata from Camera A (on band)
+        'NMB': (str, []),           # New image metadata from Camera B (off band)
+        'NIS': (str, []),           # New image from the Spectrometer
+        'CLI': (bool, 1),           # Return list of connected clients
+        'MSG': (str, []),           # Generic string message
+        }
+    # Error flag, which provides the key in which an error was found
+    cmd_dict['ERR'] = (str, list(cmd_dict.keys()))
+
+    # Tokenizer for decode_comms - each match is a command key (a whole word) followed by its value
+    _cmd_re = re.compile(r'(?<!\S)(' + '|'.join(map(re.escape, cmd_dict)) + r')\s+(\S+)')
+
+    # Validation table for decode_comms
+    _cmd_tbl = _cmd_table(cmd_dict)
+
+    # Encoded keys for encode_comms
+    _key_bytes = {key: bytes(key, SendRecvSpecs.encoding) for key in cmd_dict}
 
     def IDN(self, value, cmd_source):
         """Not sure I need to do anything here, but I've included the method just in case"""
@@ -171,6 +220,9 @@ class CommsCommandHandler(CommsFuncs):
         self.event = threading.Event()
         self.working = False
 
+        # Method to call for each command code, looked up once rather than for every command received
+        self._dispatch = {key: getattr(self, key) for key in self.cmd_dict if callable(getattr(self, key, None))}
+
         # For responses back to the connected client
         self.socket = socket
         self.id = {"IDN": "NUL"}
@@ -191,7 +243,9 @@ class CommsCommandHandler(CommsFuncs):
             try:
                 # Check message queue (taken from tuple at position [1])
                 # Make the whole command available as part of the class for accessing IDN of command sender
-                self.comm_cmd = self.q.get(block=True, timeout=0.001)
+                # Block until a command arrives - the timeout only bounds how long before the event is checked again,
+                # which is only set by EXT from within this loop
+                self.comm_cmd = self.q.get(block=True, timeout=1)
                 if self.comm_cmd:
                     networkLogging.info(f"CommsCommandHandler for {self.id} received {self.comm_cmd}")
                     if "IDN" in self.comm_cmd:
@@ -200,18 +254,20 @@ class CommsCommandHandler(CommsFuncs):
                         cmd_source = "NSR"  # no source
 
                     # Loop through each command code in the dictionary, carrying our the commands individually
-                    for key in self.comm_cmd:
-                        # Call correct method determined by 3 character code from comms message
+                    for key, value in self.comm_cmd.items():
+                        # Call correct method determined by 3 character code from comms message, if we have one
+                        method = self._dispatch.get(key)
+                        if method is None:
+                            continue
                         try:
-                            # If we have the method call it, passing it the value from comm_cmd
-                            getattr(self, key)(self.comm_cmd[key], cmd_source)
+                            method(value, cmd_source)
                         except TypeError as e:
                             if "positional argument" in str(e):
                                 # hold over from adding command source as an argument, call the old way
                                 networkLogging.warning(
                                     f"WARNING {key}() for {self.id['IDN']} is not accepting cmd_source!!!"
                                 )
-                                getattr(self, key)(self.comm_cmd[key])
+                                method(value)
                             else:
                                 raise e
                         except AttributeError:
@@ -234,8 +290,10 @@ class CommsCommandHandler(CommsFuncs):
         Send a message back from the class handling the communications
         tagged with the ID of that class, e.g., the CamComms class will send
         back messages tagged with CM1 or CM2 depending of off or on band.
+        comm is tagged in place rather than copied, so pass a new dictionary.
         """
-        self.socket.send_to_all(self.id | comm)
+        comm["IDN"] = self.id["IDN"]
+        self.socket.send_to_all(comm)
 
 
 class MasterComms(CommsCommandHandler):
@@ -355,15 +413,18 @@ class MasterComms(CommsCommandHandler):
 
         networkLogging.info('Closed all sockets')
 
-        # Wait for all threads to finish (closing sockets should cause this)
+        # Wait for all threads to finish (closing sockets should cause this), blocking on the threads rather than
+        # polling their flags. Add a timeout so if we are waiting for too long we just close things without waiting
         time_start = time.time()
         for conn in self.ext_connections:
-            while self.ext_connections[conn].working or self.ext_connections[conn].accepting:
-                # Add a timeout so if we are waiting for too long we just close things without waiting
-                time_wait = time.time() - time_start
-                if time_wait > timeout:
-                    networkLogging.info(' Reached timeout limit waiting for shutdown')
-                    break
+            ext_conn = self.ext_connections[conn]
+            if ext_conn.accepting and ext_conn.acc_thread is not None:
+                ext_conn.acc_thread.join(max(0, timeout - (time.time() - time_start)))
+            if ext_conn.working:
+                ext_conn.closed_event.wait(max(0, timeout - (time.time() - time_start)))
+            if ext_conn.working or ext_conn.accepting:
+                networkLogging.info(' Reached timeout limit waiting for shutdown')
+                break
 
         networkLogging.info('Ext connections finished')
 
@@ -391,6 +452,7 @@ class SocketMeths(CommsFuncs):
         super().__init__()
 
         self.data_buff = bytearray()  # Instantiate empty byte array to append received data to
+        self._scan_from = 0  # Position in data_buff to search for end_str from, as the bytes before it have no end_str
 
     def encode_comms(self, message: dict) -> bytearray:
         """Encode message into a single byte array
@@ -402,32 +464,34 @@ class SocketMeths(CommsFuncs):
 
         """
 
-        # Instantiate byte array
-        cmd_bytes = bytearray()
+        # Collect each key and its value as bytes, then join them into a byte array once at the end
+        parts = []
 
-        # Loop through messages and convert the values to strings, then append it to the byte array preceded by the key
+        # Loop through messages and convert the values to strings, then add them to the parts preceded by the key
         for key in message:
             # Ignore any keys that are not recognised commands
-            if key not in self.cmd_dict:
+            key_bytes = self._key_bytes.get(key)
+            if key_bytes is None:
                 continue
 
-            if self.cmd_dict[key][0] is bool or self.cmd_dict[key][0] is int:
+            cmd_type = self.cmd_dict[key][0]
+            if cmd_type is bool or cmd_type is int:
                 cmd = str(int(message[key]))
 
             # Floats are converted to strings containing 2 decimal places - is this adequate??
-            elif self.cmd_dict[key][0] is float:
+            elif cmd_type is float:
                 cmd = '{:.2f}'.format(message[key])
 
             else:
                 cmd = '{}'.format(message[key])
 
-            # Append key and cmd to bytearray
-            cmd_bytes += bytes(key + ' ' + cmd + ' ', 'utf-8')
+            parts.append(key_bytes)
+            parts.append(bytes(cmd, self.encoding))
 
-        # Add end_str bytes
-        cmd_bytes += self.end_str
+        # Add end_str bytes, then separate everything with spaces (so the last value is followed by a space too)
+        parts.append(self.end_str)
 
-        return cmd_bytes
+        return bytearray(b' ').join(parts)
 
     def decode_comms(self, message: str, return_errors: bool = False):
         """Decodes string from network communication, to extract information and check it is correct.
@@ -437,62 +501,44 @@ class SocketMeths(CommsFuncs):
         ----------
         message: str
             Message which is expected to be in the form defined by SendRecvSpecs.cmd_dict"""
-        mess_list = message.split()
-
         cmd_ret: dict[str, list[str] | bool | str | int | float] = {"ERR": []}
 
         # Generally only flag error on socket server to save duplication
         return_errors = return_errors or isinstance(self, SocketServer)
 
-        networkLogging.debug('Message: {}'.format(mess_list))
-        # Loop through commands. Stop before the last command as it will be a value rather than key and means we don't
-        # hit an IndexError when using i+1
-        for i in range(len(mess_list)-1):
-            # If the previous message was error then we need to ignore this one as it isn't a command it's an error flag
-            if i-1 > -1 and mess_list[i-1] == 'ERR':
-                continue
-
-            if mess_list[i] in self.cmd_dict.keys():
-                # If we have a bool, check that we have either 1 or 0 as command, if not, it is not valid and is ignored
-                if self.cmd_dict[mess_list[i]][0] is bool:
+        networkLogging.debug('Message: %s', message)
+        # Matches don't overlap, so a value is never mistaken for a key (e.g. the key named in an ERR flag)
+        for match in self._cmd_re.finditer(message):
+            key, value = match.groups()
+            cmd_type, accepted, cmd_max = self._cmd_tbl[key]
+
+            # If we have a bool, check that we have either 1 or 0 as command, if not, it is not valid and is ignored
+            if cmd_type is bool:
+                if value == '1':
+                    cmd = True
+                elif value == '0':
+                    cmd = False
+                else:
+                    cmd = None
 
-                    # Flag error with command if it is not recognised
-                    if mess_list[i+1] not in ['1', '0']:
-                        if return_errors and isinstance(cmd_ret['ERR'], list):
-                            cmd_ret['ERR'].append(mess_list[i])
-                        continue
-                    else:
-                        cmd = bool(int(mess_list[i+1]))
-
-                # If we have a str, check it within the accepted str list
-                elif self.cmd_dict[mess_list[i]][0] is str:
-                    # Some messages accept any input form - this is signified by an empty list in cmd_dict.
-                    # So if this is the case we don't check if the command is valid
-                    if len(self.cmd_dict[mess_list[i]][1]) == 0:
-                        cmd = mess_list[i+1]
-                    else:
-                        # Flag error with command if it is not recognised
-                        if mess_list[i+1] not in self.cmd_dict[mess_list[i]][1]:
-                            if return_errors and isinstance(cmd_ret['ERR'], list):
-                                cmd_ret['ERR'].append(mess_list[i])
-                            continue
-                        else:
-                            cmd = mess_list[i+1]
+            # If we have a str, check it within the accepted str list. Some messages accept any input form - this is
+            # signified by an empty list in cmd_dict, so if this is the case we don't check if the command is valid
+            elif cmd_type is str:
+                cmd = value if accepted is None or value in accepted else None
 
-                # Otherwise we convert message to its type and then test that outcome is within defined bounds
-                else:
-                    # print('Possible error debugging. Got command: {} for type {}, value: {}'.format(mess_list[i],
-                    #                                                                      self.cmd_dict[mess_list[i]][0],
-                    #                                                                                 mess_list[i+1]))
-                    cmd = self.cmd_dict[mess_list[i]][0](mess_list[i+1])
-
-                    # Flag error with command if it is not recognised
-                    if cmd < self.cmd_dict[mess_list[i]][1][0] or cmd > self.cmd_dict[mess_list[i]][1][-1]:
-                        if return_errors and isinstance(cmd_ret['ERR'], list):
-                            cmd_ret['ERR'].append(mess_list[i])
-                        continue
+            # Otherwise we convert message to its type and then test that outcome is within defined bounds
+            else:
+                cmd = cmd_type(value)
+                if cmd < accepted or cmd > cmd_max:
+                    cmd = None
+
+            # Flag error with command if it is not recognised
+            if cmd is None:
+                if return_errors and isinstance(cmd_ret['ERR'], list):
+                    cmd_ret['ERR'].append(key)
+                continue
 
-                cmd_ret[mess_list[i]] = cmd
+            cmd_ret[key] = cmd
 
         # If we haven't thrown any errors we can remove this key so that it isn't sent in message
         if (isinstance(cmd_ret['ERR'], list) and len(cmd_ret['ERR']) == 0) or not return_errors:
@@ -531,15 +577,19 @@ class SocketMeths(CommsFuncs):
 
         # This was formerly a while looping waiting forever, instead wait at most 5 seconds
         for ii in range(0, 5):
-            if self.end_str not in self.data_buff:
+            # Only search the bytes not already searched (plus an overlap in case end_str was split across reads)
+            end_idx = self.data_buff.find(self.end_str, self._scan_from)
+            if end_idx == -1:
+                self._scan_from = max(0, len(self.data_buff) - (self.len_end_str - 1))
+
                 # Wait up to 1 second for some new data
-                ready = select.select([connection], [], [], 1)[0]
+                ready = wait_readable(connection, 1)
             else:
                 ready = False
 
             if ready:
-                # Receive data and add to buffer
-                received = connection.recv(4096)
+                # Receive data and add to buffer, taking everything already queued on the socket in one call
+                received = connection.recv(self.recv_size)
 
                 # Sockets are blocking, so if we receive no data it means the socket has been closed - so raise error
                 if len(received) == 0:
@@ -547,13 +597,15 @@ class SocketMeths(CommsFuncs):
 
                 self.data_buff += received
 
-                networkLogging.debug(f"Raw received: {self.data_buff}")
+                networkLogging.debug("Raw received: %s", self.data_buff)
+
+                end_idx = self.data_buff.find(self.end_str, self._scan_from)
 
             # Once we have a full message, with end_str, we return it after removing the end_str and decoding to a str
-            if self.end_str in self.data_buff:
-                end_idx = self.data_buff.find(self.end_str)
+            if end_idx != -1:
                 ret = self.data_buff[:end_idx].decode(self.encoding)
-                self.data_buff = self.data_buff[end_idx + len(self.end_str) :]
+                del self.data_buff[:end_idx + self.len_end_str]
+                self._scan_from = 0
                 return ret
 
         return ""
@@ -708,20 +760,12 @@ class SocketClient(SocketMeths):
 
     def generate_header(self, msg_size):
         """Generates a header with the given message size and returns byte array version"""
-        header = self.header_char + str(msg_size).rjust(self.header_num_size, '0') + self.ret_char
-        return header.encode()
+        return self.header_start + b'%0*d' % (self.header_num_size, msg_size) + self.header_end
 
     def _decode_msg(self, msg):
-        """Decodes message into dictionary"""
-        # Unpack data from bytes
-        data = self.pack_fmt.unpack(msg)
-
-        # Unpack into dictionary
-        dictionary = dict()
-        for i in range(len(self.pack_info)):
-            dictionary[self.pack_info[i]] = data[i]
-
-        return dictionary
+        """Decodes message (any bytes-like object, e.g. a memoryview, to avoid a copy) into dictionary"""
+        # Unpack data from bytes, pairing each value with its name
+        return dict(zip(self.pack_info, self.pack_fmt.unpack_from(msg)))
 
 
 class CamComms(CommsCommandHandler):
@@ -1572,6 +1616,7 @@ class Connection:
 
         self.q = queue.Queue()              # Queue for accessing information
         self.event = threading.Event()      # Event to close receiving function
+        self.closed_event = threading.Event()   # Event set once the connection thread has stopped
         self.func_thread = None             # Thread for receiving communication data
         self.acc_thread = None
 
@@ -1626,14 +1671,22 @@ class Connection:
         if self.working:
             # Don't restart if we are already running the thread
             return
-        self.func_thread = threading.Thread(target=self._thread_func,
+        self.func_thread = threading.Thread(target=self._run_thread_func,
                                             args=())
         self.func_thread.name = f"{self.__class__.__name__} connection handling thread ({self.connection_tuple})"
         self.func_thread.daemon = True
         self.event.clear()
+        self.closed_event.clear()
         self.working = True
         self.func_thread.start()
 
+    def _run_thread_func(self):
+        """Runs _thread_func, flagging closed_event when it returns so that other threads can wait on it"""
+        try:
+            self._thread_func()
+        finally:
+            self.closed_event.set()
+
     def _thread_func(self):
         """Function to be overwritten by child classes"""
         pass
@@ -3,6 +3,8 @@
 """Contains SSH functions used for some initial communications between pis"""
 from pycam.logging.logging_tools import LoggerManager
 
+import socket
+
 networkLogging = LoggerManager.add_logger("Networking")
 
 
@@ -57,6 +59,49 @@ def ssh_cmd(client, cmd, background=True):
     return stdin, stdout, stderr
 
 
+def ssh_cmd_stdin(client, cmd, data, timeout=30):
+    """Runs a command on the SSH client, streaming data to its stdin on the same channel
+
+    Parameters
+    ----------
+    client: paramiko.SSHClient
+        Client object where command is to be sent
+    cmd: str
+        Command to be run (e.g. 'crontab -')
+    data: bytes
+        Data written to stdin of the command
+    timeout: float
+        Maximum time (s) to wait for each step - opening the channel, sending data and the command finishing
+
+    :returns
+    exit_status: int
+        Exit status of the remote command
+
+    :raises
+    TimeoutError
+        If the command doesn't finish within the timeout (e.g. the connection has dropped)
+    """
+    networkLogging.info('Sending SSH command with stdin: {}'.format(cmd))
+    try:
+        channel = client.get_transport().open_session(timeout=timeout)
+        channel.settimeout(timeout)
+        try:
+            channel.exec_command(cmd)
+            channel.sendall(data)
+            channel.shutdown_write()
+
+            # recv_exit_status() ignores the channel timeout, so wait for the exit status with our own
+            if not channel.status_event.wait(timeout):
+                raise socket.timeout()
+            exit_status = channel.recv_exit_status()
+        finally:
+            channel.close()
+    except socket.timeout:
+        raise TimeoutError('SSH command timed out after {} s: {}'.format(timeout, cmd))
+
+    return exit_status
+
+
 def file_upload(client, remote_path, local_path):
     """Uploads file to remote system
 
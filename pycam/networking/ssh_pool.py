@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+"""Pool of persistent SSH connections, so that repeated commands sent to an instrument reuse a single authenticated
+session rather than performing a full connect/login for every command"""
+
+import atexit
+import threading
+from contextlib import contextmanager
+
+from pycam.networking.ssh import open_ssh, close_ssh
+from pycam.logging.logging_tools import LoggerManager
+
+networkLogging = LoggerManager.add_logger("Networking")
+
+
+class SSHConnectionPool:
+    """
+    Holds open paramiko.SSHClient objects keyed by (ip, user, port)
+
+    :param keepalive:   int     Interval (seconds) between keepalive packets sent on idle connections
+    """
+    def __init__(self, keepalive=30):
+        self.keepalive = keepalive
+        self._pool = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _is_alive(client):
+        """Checks that the transport of a pooled client is still usable"""
+        transport = client.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+        try:
+            transport.send_ignore()
+        except (EOFError, OSError):
+            return False
+        return True
+
+    def _connect(self, key, pwd):
+        """Opens a new SSH client for key and stores it in the pool"""
+        ip, uname, port = key
+        client = open_ssh(ip, uname=uname, pwd=pwd, port=port)
+        client.get_transport().set_keepalive(self.keepalive)
+        self._pool[key] = client
+        networkLogging.info(f'Opened pooled SSH connection to {uname}@{ip}:{port}')
+        return client
+
+    @contextmanager
+    def get_connection(self, ip, uname='pi', pwd='raspberry', port=22):
+        """
+        Context manager yielding an open SSH client for this address. Clients are reused between calls and are only
+        reopened if the previous connection has died. If the command raises an SSH/socket error the client is evicted
+        so the next call reconnects.
+        """
+        import paramiko
+        key = (ip, uname, int(port))
+        with self._lock:
+            client = self._pool.get(key)
+            if client is not None and not self._is_alive(client):
+                self._evict(key)
+                client = None
+            if client is None:
+                client = self._connect(key, pwd)
+
+        try:
+            yield client
+        except (paramiko.SSHException, EOFError, OSError):
+            with self._lock:
+                self._evict(key)
+            raise
+
+    def _evict(self, key):
+        """Closes and removes client from the pool. Must be called with self._lock held"""
+        client = self._pool.pop(key, None)
+        if client is not None:
+            try:
+                close_ssh(client)
+            except BaseException as e:
+                networkLogging.warning(f'Error closing pooled SSH connection: {e}')
+
+    def close_all(self):
+        """Closes all pooled connections"""
+        with self._lock:
+            for key in list(self._pool):
+                self._evict(key)
+
+
+# Module level pool shared by the GUI
+pool = SSHConnectionPool()
+atexit.register(pool.close_all)
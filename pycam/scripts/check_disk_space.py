@@ -11,6 +11,9 @@ sys.path.append('/home/pi/')
 
 from pycam.setupclasses import FileLocator
 from pycam.utils import recursive_files_in_path
+from pycam.logging.logging_tools import LoggerManager
+
+LoggerManager.configure_root()
 
 print(f"Running {__file__} at {datetime.datetime.now()}")
 
@@ -34,8 +37,8 @@ if day in del_days:
         # Catch exception just in case the file disappears before it can be removed
         # (may get transferred then deleted by other program)
         try:
-            # If it is a lock file we just ignore it
-            if '.lock' in file_path:
+            # If it is a lock file or a file still being written we just ignore it
+            if '.lock' in file_path or file_path.endswith('.part'):
                 continue
 
             # Check file isn't locked, if it is we just leave it
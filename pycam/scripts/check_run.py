@@ -17,6 +17,9 @@ from pycam.setupclasses import CameraSpecs, SpecSpecs, FileLocator, ConfigInfo
 from pycam.networking.sockets import SocketClient, ExternalSendConnection, ExternalRecvConnection, read_network_file
 from pycam.io_py import read_script_crontab
 from pycam.utils import read_file, StorageMount, append_to_log_file, recursive_files_in_path, kill_process
+from pycam.logging.logging_tools import LoggerManager
+
+LoggerManager.configure_root()
 
 print(f"Running {__file__} at {datetime.datetime.now()}")
 
@@ -126,7 +129,7 @@ def restart_pycam(force=False, master_script_name="pycam_master2"):
 
 # -----------------------------------------------------------
 # First check if check_run is already running - if so, we don't want to run again as we may interrupt the function
-proc = subprocess.Popen(['ps axg'], stdout=subprocess.PIPE, shell=True)
+proc = subprocess.Popen(['ps', 'axg'], stdout=subprocess.PIPE)
 stdout_value = proc.communicate()[0]
 stdout_str = stdout_value.decode("utf-8")
 stdout_lines = stdout_str.split('\n')
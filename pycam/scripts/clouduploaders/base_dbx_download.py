@@ -8,8 +8,11 @@ import threading
 from pycam.utils import read_file
 from pycam.setupclasses import FileLocator
 from pycam.scripts.clouduploaders.dropbox_io import DropboxIO
+from pycam.logging.logging_tools import LoggerManager
 import time
 
+LoggerManager.configure_root()
+
 
 # Add new cameras here to download
 cameras = ['Sheffield']
@@ -6,8 +6,11 @@ sys.path.append('/home/pi/')
 from pycam.utils import read_file
 from pycam.setupclasses import FileLocator
 from pycam.scripts.clouduploaders.dropbox_io import DropboxIO
+from pycam.logging.logging_tools import LoggerManager
 import time
 
+LoggerManager.configure_root()
+
 
 # Endlessly loop around creating the dropbox downloader - if we hit an exception, for instance a connection error, we
 # just delete the dropbox object and then the loop will recreate it
@@ -177,7 +177,7 @@ class DropboxIO:
             # print('File list: {}'.format(files))
 
             # Get all pertinent files, if there are none left we return
-            data_files = [x for x in files if self.cam_specs.file_ext in x or self.spec_specs.file_ext in x]
+            data_files = [x for x in files if x.endswith((self.cam_specs.file_ext, self.spec_specs.file_ext))]
             if len(data_files) < 1:
                 print('Existing files all uploaded')
                 return
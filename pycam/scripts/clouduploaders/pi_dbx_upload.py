@@ -5,14 +5,17 @@ sys.path.append('/home/pi/')
 
 from pycam.setupclasses import FileLocator
 from pycam.scripts.clouduploaders.dropbox_io import DropboxIO
+from pycam.logging.logging_tools import LoggerManager
 
 import subprocess
 import os
 import time
 
+LoggerManager.configure_root()
+
 # ------------------------------------------------------------------
 # Check if pi_dbx_upload.py is already running, and if so kill it
-proc = subprocess.Popen(['ps axg'], stdout=subprocess.PIPE, shell=True)
+proc = subprocess.Popen(['ps', 'axg'], stdout=subprocess.PIPE)
 stdout_value = proc.communicate()[0]
 stdout_str = stdout_value.decode("utf-8")
 stdout_lines = stdout_str.split('\n')
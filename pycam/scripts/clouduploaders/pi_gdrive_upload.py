@@ -6,6 +6,9 @@ sys.path.append('/home/pi/')
 from pycam.utils import read_file
 from pycam.setupclasses import FileLocator
 from pycam.scripts.clouduploaders.gdrive_uploader import GoogleDriveUploader
+from pycam.logging.logging_tools import LoggerManager
+
+LoggerManager.configure_root()
 
 gdrive = GoogleDriveUploader(watch_folder=FileLocator.IMG_SPEC_PATH)
 
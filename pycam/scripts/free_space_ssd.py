@@ -15,6 +15,9 @@ import datetime
 sys.path.append("/home/pi/")
 
 from pycam.utils import StorageMount
+from pycam.logging.logging_tools import LoggerManager
+
+LoggerManager.configure_root()
 
 print(f"Running {__file__} at {datetime.datetime.now()}")
 
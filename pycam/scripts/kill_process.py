@@ -13,5 +13,8 @@ import sys
 sys.path.append(os.path.expanduser("~"))  # e.g., /home/pi on the pi
 
 from pycam.utils import kill_process
+from pycam.logging.logging_tools import LoggerManager
+
+LoggerManager.configure_root()
 
 kill_process()
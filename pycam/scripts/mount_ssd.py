@@ -9,6 +9,9 @@ import sys
 sys.path.append('/home/pi/')
 
 from pycam.utils import StorageMount
+from pycam.logging.logging_tools import LoggerManager
+
+LoggerManager.configure_root()
 
 mount = StorageMount()
 mount.mount_dev()
@@ -47,7 +47,7 @@ import os
 sys.path.append(os.path.expanduser("~"))  # e.g., /home/pi on the pi
 
 from pycam.controllers import Camera, Spectrometer
-from pycam.io_py import save_img, save_spectrum
+from pycam.io_py import save_img, save_spectrum, encode_img
 from pycam.networking.sockets import (
     SocketServer,
     CommConnection,
@@ -57,6 +57,7 @@ from pycam.networking.sockets import (
 )
 from pycam.utils import read_file, write_file, StorageMount
 from pycam.setupclasses import ConfigInfo, FileLocator
+from pycam.logging.logging_tools import LoggerManager
 
 import argparse
 import atexit
@@ -67,6 +68,8 @@ import signal
 import socket
 import threading
 
+LoggerManager.configure_root()
+
 print(f"Running {__file__} at {time.strftime('%Y-%m-%d %H:%M:%S')}")
 
 # -----------------------------------------------------------------
@@ -283,8 +286,15 @@ while running:
                         instrument.img_q.get(False)
                     )
 
+                    # The image is encoded on the first save, then the same bytes are written to every save path
+                    encoded_img = []
+
                     # wrapper function to save image
                     def save_img_local(new_file, new_meta):
+                        if not encoded_img:
+                            encoded_img.append(
+                                encode_img(image, instrument.file_ext, compression=True)
+                            )
                         save_img(
                             image,
                             new_file,
@@ -293,6 +303,7 @@ while running:
                             meta_filename=new_meta,
                             meta_ext=instrument.meta_ext,
                             compression=True,
+                            encoded=encoded_img[0],
                         )
 
                 elif isinstance(instrument, Spectrometer):
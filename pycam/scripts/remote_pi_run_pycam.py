@@ -13,6 +13,9 @@ import os
 from pycam.networking.ssh import open_ssh, close_ssh, ssh_cmd
 from pycam.setupclasses import FileLocator, ConfigInfo
 from pycam.utils import read_file
+from pycam.logging.logging_tools import LoggerManager
+
+LoggerManager.configure_root()
 
 # Read config file
 cfg = read_file(FileLocator.CONFIG)
@@ -14,9 +14,12 @@ sys.path.append(os.path.expanduser("~"))  # e.g., /home/pi on the pi
 
 from pycam.utils import read_file, append_to_log_file
 from pycam.setupclasses import FileLocator, ConfigInfo
+from pycam.logging.logging_tools import LoggerManager
 import subprocess
 import time
 
+LoggerManager.configure_root()
+
 print(f"Running {__file__} at {time.strftime('%Y-%m-%d %H:%M:%S')}")
 
 # Read configuration file which contains important information for various things
@@ -46,7 +49,7 @@ else:
     print("Continuous capture automatically enabled")
 
 try:
-    proc = subprocess.Popen(["ps axg"], stdout=subprocess.PIPE, shell=True)
+    proc = subprocess.Popen(["ps", "axg"], stdout=subprocess.PIPE)
     stdout_value = proc.communicate()[0]
     stdout_str = stdout_value.decode("utf-8")
     stdout_lines = stdout_str.split("\n")
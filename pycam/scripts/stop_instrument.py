@@ -15,8 +15,11 @@ sys.path.append(os.path.expanduser("~"))  # e.g., /home/pi on the pi
 from pycam.utils import read_file, append_to_log_file
 from pycam.setupclasses import FileLocator, ConfigInfo
 from pycam.networking.sockets import SocketClient, read_network_file
+from pycam.logging.logging_tools import LoggerManager
 import time
 
+LoggerManager.configure_root()
+
 print(f"Running {__file__} at {time.strftime('%Y-%m-%d %H:%M:%S')}")
 
 
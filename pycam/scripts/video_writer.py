@@ -6,8 +6,11 @@ GUI. i.e. it's just a short-cut to make your life easier if you have lots of day
 """
 
 from pycam.io_py import create_video
+from pycam.logging.logging_tools import LoggerManager
 import os
 
+LoggerManager.configure_root()
+
 # Define directory where data directories are located
 parent_directory = 'X:/volcano_cameras/Shared/Cotopaxi/2024/'
 
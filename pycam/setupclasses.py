@@ -14,6 +14,7 @@ import numpy.typing
 import inspect
 import os
 import platform
+import functools
 
 pycamLogger = LoggerManager.add_logger("Pycam")
 
@@ -24,7 +25,10 @@ pycam_details = {
     }
 
 
+@functools.cache
 def running_on_pi() -> bool:
+    """Checks whether we are running on a raspberry pi. Result is cached as the platform can't change at runtime and
+    this is called on every FileLocator attribute access"""
     if not platform.machine() == 'aarch64':
         return False
 
@@ -6,3 +6,55 @@ def test_load_picam_png():
     bad_path = "this/doesnt/exist"
     with pytest.raises(FileNotFoundError):
         io_py.load_picam_png(bad_path)
+
+# Test image and metadata survive a fast save/load round trip
+def test_save_img_fast(tmp_path):
+    import numpy as np
+    img = np.arange(12, dtype=np.uint16).reshape(3, 4)
+    meta = {"texp": 0.01, "device_id": "picam-1"}
+    filename = str(tmp_path / "img.npz")
+    io_py.save_img_fast(img, filename, metadata=meta)
+    loaded_img, loaded_meta = io_py.load_img_fast(filename)
+    assert np.array_equal(loaded_img, img)
+    assert loaded_img.dtype == img.dtype
+    assert loaded_meta == meta
+    assert not (tmp_path / "img.npz.part").exists()
+
+# Test crontab times are read for each requested script
+def test_read_script_crontab(tmp_path):
+    schedule = tmp_path / "script_schedule.txt"
+    schedule.write_text("# Crontab schedule file written by pycam\n"
+                        "00 09 * * * python3 /home/pi/pycam/scripts/start_instrument.py >> cron.log 2>&1\n"
+                        "*/15 * * * * python3 /home/pi/pycam/scripts/check_disk_space.py >> cron.log 2>&1\n"
+                        "0 * * * * python3 /home/pi/pycam/scripts/free_space_ssd.py\n"
+                        "# */5 * * * * bash /home/pi/pycam/scripts/log_temperature.sh\n")
+    cmds = ["/home/pi/pycam/scripts/start_instrument.py", "/home/pi/pycam/scripts/check_disk_space.py",
+            "/home/pi/pycam/scripts/free_space_ssd.py", "/home/pi/pycam/scripts/log_temperature.sh",
+            "/home/pi/pycam/scripts/stop_instrument.py"]
+    times = io_py.read_script_crontab(str(schedule), cmds)
+    assert times == {cmds[0]: (9, 0), cmds[1]: (0, 15), cmds[2]: (0, 60), cmds[3]: (0, 0)}
+
+# Test images and metadata round trip through a session HDF5 file
+def test_h5_image_writer(tmp_path):
+    import numpy as np
+    pytest.importorskip("h5py")
+    img = np.arange(12, dtype=np.uint16).reshape(3, 4)
+    meta = {"texp": 0.01, "device_id": "picam-1"}
+    filename = str(tmp_path / "session.h5")
+    with io_py.H5ImageWriter(filename) as writer:
+        writer.save(img, "img_1", metadata=meta)
+    with io_py.H5ImageWriter(filename) as writer:
+        loaded_img, loaded_meta = writer.load("img_1")
+    assert np.array_equal(loaded_img, img)
+    assert loaded_meta == meta
+
+# Test saving into a folder still works after the folder is removed (e.g. by the disk space clean up)
+def test_save_img_fast_removed_dir(tmp_path):
+    import numpy as np
+    import shutil
+    img = np.zeros((3, 4), dtype=np.uint16)
+    filename = str(tmp_path / "day" / "img.npz")
+    io_py.save_img_fast(img, filename)
+    shutil.rmtree(tmp_path / "day")
+    io_py.save_img_fast(img, filename)
+    assert np.array_equal(io_py.load_img_fast(filename)[0], img)
@@ -0,0 +1,112 @@
+import logging
+from pycam.logging.logging_tools import LoggerManager
+
+# Test all console handlers are removed, including adjacent ones, while file handlers are kept
+def test_remove_stream_handlers(tmp_path):
+    logger = logging.getLogger("test_remove_stream_handlers")
+    file_handler = logging.FileHandler(tmp_path / "test.log")
+    logger.handlers = [logging.StreamHandler(), logging.StreamHandler(), file_handler, logging.StreamHandler()]
+
+    LoggerManager.remove_stream_handlers(logger)
+
+    assert logger.handlers == [file_handler]
+    file_handler.close()
+
+# Test file handlers buffer records until an error is logged or the handler is flushed
+def test_file_handler_buffering(tmp_path):
+    log_path = tmp_path / "test.log"
+    logger = logging.getLogger("test_file_handler_buffering")
+    logger.setLevel(logging.DEBUG)
+    file_handler = LoggerManager.create_file_handler(log_path)
+    logger.addHandler(file_handler)
+
+    logger.info("buffered")
+    assert log_path.read_text() == ""
+    logger.error("flushed")
+    assert "buffered" in log_path.read_text() and "flushed" in log_path.read_text()
+
+    logger.info("flushed explicitly")
+    file_handler.flush()
+    assert "flushed explicitly" in log_path.read_text()
+
+    logger.removeHandler(file_handler)
+    file_handler.close()
+
+# Test buffered records are written by the periodic flush
+def test_flush_file_handlers(tmp_path):
+    log_path = tmp_path / "test.log"
+    logger = logging.getLogger("test_flush_file_handlers")
+    logger.setLevel(logging.DEBUG)
+    file_handler = LoggerManager.create_file_handler(log_path)
+    logger.addHandler(file_handler)
+
+    logger.info("buffered")
+    LoggerManager.flush_file_handlers()
+    assert "buffered" in log_path.read_text()
+
+    logger.removeHandler(file_handler)
+    file_handler.close()
+
+# Test the most recent memory handler records are kept until a target is set, then flushed to it
+def test_mem_handler_target(tmp_path):
+    log_path = tmp_path / "test.log"
+    logger = logging.getLogger("test_mem_handler_target")
+    logger.setLevel(logging.DEBUG)
+    LoggerManager.add_mem_handler(logger, "test_mem_handler_target", capacity=2)
+
+    for i in range(3):
+        logger.info(f"record {i}")
+
+    file_handler = LoggerManager.create_file_handler(log_path)
+    mem_handler = LoggerManager.set_mem_handler_target("test_mem_handler_target", file_handler)
+    mem_handler.flush()
+    file_handler.flush()
+    assert "record 0" not in log_path.read_text()
+    assert all(f"record {i}" in log_path.read_text() for i in range(1, 3))
+
+    LoggerManager.remove_mem_handler(logger, "test_mem_handler_target", delete=True)
+    file_handler.close()
+
+# Test repeated records are dropped within the dedup interval, and the next one through notes how many were dropped
+def test_dedup_file_handler(tmp_path):
+    log_path = tmp_path / "test.log"
+    logger = logging.getLogger("test_dedup_file_handler")
+    logger.setLevel(logging.DEBUG)
+    file_handler = LoggerManager.create_file_handler(log_path)
+    logger.addHandler(file_handler)
+
+    for _ in range(5):
+        logger.info("repeated message")
+    logger.info("another message")
+    file_handler.flush()
+    assert log_path.read_text().count("repeated message") == 1
+    assert "another message" in log_path.read_text()
+
+    # Let the next repeat through by moving the last time it was logged back past the interval
+    for entry in file_handler._seen.values():
+        entry[0] -= file_handler.dedup_interval
+    logger.info("repeated message")
+    file_handler.flush()
+    assert log_path.read_text().count("repeated message") == 2
+    assert "repeated message (repeated 4 times)" in log_path.read_text()
+
+    logger.removeHandler(file_handler)
+    file_handler.close()
+
+# Test repeats are also dropped when buffered records are written from a memory handler
+def test_dedup_mem_handler_target(tmp_path):
+    log_path = tmp_path / "test.log"
+    logger = logging.getLogger("test_dedup_mem_handler_target")
+    logger.setLevel(logging.DEBUG)
+    LoggerManager.add_mem_handler(logger, "test_dedup_mem_handler_target")
+
+    for _ in range(3):
+        logger.info("repeated message")
+
+    file_handler = LoggerManager.create_file_handler(log_path)
+    mem_handler = LoggerManager.set_mem_handler_target("test_dedup_mem_handler_target", file_handler)
+    mem_handler.flush()
+    assert log_path.read_text().count("repeated message") == 1
+
+    LoggerManager.remove_mem_handler(logger, "test_dedup_mem_handler_target", delete=True)
+    file_handler.close()
@@ -1,5 +1,5 @@
 import pytest
-from pycam.utils import truncate_path
+from pycam.utils import truncate_path, read_file, write_file
 
 normal_test_data = [
     (None, 10, ''),
@@ -24,4 +24,20 @@ error_test_data = [
 @pytest.mark.parametrize("path, max_length, msg", error_test_data)
 def test_truncate_path_error(path, max_length, msg):
     with pytest.raises(ValueError, match=msg):
-        truncate_path(path, max_length)
\ No newline at end of file
+        truncate_path(path, max_length)
+
+
+def test_read_file_reflects_changes(tmp_path):
+    filename = str(tmp_path / 'config.txt')
+    open(filename, 'w').close()
+
+    write_file(filename, {'port': 12345})
+    data = read_file(filename)
+    assert data == {'port': '12345'}
+
+    # Returned dictionary is a copy so editing it doesn't affect later reads
+    data['port'] = 'edited'
+    assert read_file(filename) == {'port': '12345'}
+
+    write_file(filename, {'port': 54321})
+    assert read_file(filename) == {'port': '54321'}
@@ -5,6 +5,7 @@ from pycam.networking.ssh import open_ssh, close_ssh, ssh_cmd
 from pycam.logging.logging_tools import LoggerManager
 
 import os
+import functools
 import numpy as np
 import subprocess
 import datetime
@@ -60,6 +61,9 @@ def write_file(filename, my_dict, description=None):
     except ValueError:
         raise
 
+    # Ensure read_file() doesn't return stale data if the file is rewritten within the filesystem's mtime resolution
+    _read_file_cached.cache_clear()
+
     with open(filename, 'w') as f:
         f.write('# -*- coding: utf-8 -*-\n')
         if description:
@@ -90,6 +94,15 @@ def read_file(filename, separator='=', ignore='#'):
     # Check we are working with a text file
     check_filename(filename, 'txt')
 
+    # Parsed files are cached, keyed by modification time and size so that any change on disk forces a re-read.
+    # A copy is returned so callers can't edit the cached dictionary
+    stat = os.stat(filename)
+    return dict(_read_file_cached(filename, stat.st_mtime_ns, stat.st_size, separator, ignore))
+
+
+@functools.lru_cache(maxsize=32)
+def _read_file_cached(filename, mtime, size, separator, ignore):
+    """Cached worker for read_file(). mtime and size are only used as part of the cache key"""
     # Create empty dictionary to be filled
     data = dict()
 
@@ -189,7 +202,7 @@ def kill_process(process='pycam_master2'):
     process: str
         String for process to be killed, this may kill any process containing this as a substring, so use with caution
     """
-    proc = subprocess.Popen(['ps axg'], stdout=subprocess.PIPE, shell=True)
+    proc = subprocess.Popen(['ps', 'axg'], stdout=subprocess.PIPE)
     stdout_value = proc.communicate()[0]
     stdout_str = stdout_value.decode("utf-8")
     stdout_lines = stdout_str.split('\n')
@@ -517,8 +530,8 @@ class StorageMount:
             # Catch exception just in case the file disappears before it can be removed
             # (may get transferred then deleted by other program)
             try:
-                # If it is a lock file we just ignore it
-                if ".lock" in file_path:
+                # If it is a lock file or a file still being written we just ignore it
+                if ".lock" in file_path or file_path.endswith(".part"):
                     continue
 
                 # Check file isn't locked, if it is we just leave it